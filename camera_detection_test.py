@@ -28,12 +28,18 @@ import time
 import argparse
 import sys
 import os
-from datetime import datetime
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 from typing import List, Tuple, Optional
 
 try:
     from ultralytics import YOLO
     import numpy as np
+    import torch
+    import yaml
+    from modules.yolo_detector import CALIBRATION_FRAMES, CALIBRATION_YAML, save_calibration_dataset
 except ImportError as e:
     print(f"必要なライブラリがインストールされていません: {e}")
     print("以下のコマンドでインストールしてください:")
@@ -41,11 +47,62 @@ except ImportError as e:
     sys.exit(1)
 
 
+# Numbaは任意ライブラリ（インストールされている場合のみ描画処理を高速化）
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def fill_rects_numba(frame: np.ndarray, rects: np.ndarray, colors: np.ndarray) -> None:
+        """
+        複数の矩形をまとめて塗りつぶす（Numbaで機械語にコンパイル）
+        
+        Args:
+            frame: 描画先フレーム (H, W, 3)
+            rects: 矩形座標の配列 (N, 4)、[x1, y1, x2, y2]（x2, y2を含む）
+            colors: 各矩形の色の配列 (N, 3)、BGR形式
+        """
+        height, width = frame.shape[0], frame.shape[1]
+        for i in range(rects.shape[0]):
+            # 画面外にはみ出す部分は切り取り
+            x1 = max(rects[i, 0], 0)
+            y1 = max(rects[i, 1], 0)
+            x2 = min(rects[i, 2], width - 1)
+            y2 = min(rects[i, 3], height - 1)
+            for y in range(y1, y2 + 1):
+                for x in range(x1, x2 + 1):
+                    frame[y, x, 0] = colors[i, 0]
+                    frame[y, x, 1] = colors[i, 1]
+                    frame[y, x, 2] = colors[i, 2]
+
+
 class CameraDetector:
     """カメラ検出クラス - YOLOv8を用いた犬猫検出"""
     
+    # エクスポート形式ごとの出力ディレクトリ名（Ultralyticsの命名規則）
+    EXPORT_SUFFIXES = {
+        "ncnn": "_ncnn_model",
+        "openvino": "_openvino_model",
+    }
+    
+    # 情報表示（HUD）の描画領域（上部・下部の行数）
+    HUD_TOP_ROWS = 100
+    HUD_BOTTOM_ROWS = 30
+    
+    SAVE_DIR = "captured_frames"
+    
+    # CPUコア割り当て（Pi 5の4コア構成：カメラ取得に1コア、推論に残り3コア）
+    CAPTURE_CORES = {3}
+    INFERENCE_CORES = {0, 1, 2}
+    
     def __init__(self, model_path: str = "yolov8n.pt", confidence: float = 0.5, 
-                 resolution: Tuple[int, int] = (640, 480), target_fps: int = 30):
+                 resolution: Tuple[int, int] = (320, 240), target_fps: int = 30,
+                 export_format: str = "ncnn", quantize: str = "none",
+                 imgsz: int = 320, detect_every: int = 5, headless: bool = False):
         """
         コンストラクタ
         
@@ -54,19 +111,31 @@ class CameraDetector:
             confidence: 検出信頼度の閾値
             resolution: カメラ解像度 (width, height)
             target_fps: 目標フレームレート
+            export_format: 推論用エクスポート形式（"ncnn", "openvino", "none"）
+            quantize: 量子化モード（"none", "fp16", "int8"）
+            imgsz: 推論時の入力画像サイズ（32の倍数、小さいほど高速）
+            detect_every: YOLO検出を行うフレーム間隔（間のフレームは軽量トラッカーで追跡）
+            headless: Trueの場合は描画と画面表示を行わず、検出結果をコンソールに出力
         """
         self.model_path = model_path
         self.confidence = confidence
         self.resolution = resolution
         self.target_fps = target_fps
+        self.export_format = export_format
+        self.quantize = quantize
+        self.imgsz = imgsz
+        self.detect_every = detect_every
+        self.headless = headless
         
         # カメラとモデルのインスタンス
         self.cap = None
         self.model = None
+        self.predictor = None  # 事前構築した推論器（load_modelで設定）
         
         # COCO dataset class IDs (YOLOv8で使用)
         self.DOG_CLASS_ID = 16    # dog
         self.CAT_CLASS_ID = 15    # cat
+        self.target_class_ids = [self.DOG_CLASS_ID, self.CAT_CLASS_ID]
         
         # 表示色の設定 (BGR形式)
         self.colors = {
@@ -80,15 +149,106 @@ class CameraDetector:
             self.CAT_CLASS_ID: "Cat"
         }
         
+        # 描画文字サイズのキャッシュ（毎フレームのgetTextSize計算を省略）
+        self.help_text = "Press 'q' or ESC to quit, 's' to save"
+        self.help_text_size = cv2.getTextSize(
+            self.help_text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)[0]
+        self.label_sizes = {}
+        
+        # 事前描画した情報表示（HUD）のキャッシュ
+        self.hud_key = None
+        self.hud_top = None
+        self.hud_top_mask = None
+        self.hud_bottom = None
+        self.hud_bottom_mask = None
+        
         # パフォーマンス監視用
         self.fps_counter = 0
         self.fps_start_time = time.time()
         self.current_fps = 0.0
-        self.processing_times = []
+        self.processing_times = deque(maxlen=100)  # 最新100フレーム分のみ保持
+        self.avg_processing_time = None  # 表示用の平均処理時間（1秒ごとに更新）
         
         # 検出統計
         self.dog_count = 0
         self.cat_count = 0
+        
+        # 検出間フレーム用の軽量トラッカー
+        self.tracker = None
+        self.tracked_detection = None
+        
+        # スレッド間のフレーム受け渡し（1枠のみ、古いフレームは破棄）
+        self.frame_queue = queue.Queue(maxsize=1)
+        self.display_queue = queue.Queue(maxsize=1)
+        self.stop_event = threading.Event()
+        self.capture_thread = None
+        self.display_thread = None
+        
+        # 保存先ディレクトリの作成と連番カウンタの初期化（既存ファイルの続きから採番）
+        os.makedirs(self.SAVE_DIR, exist_ok=True)
+        self.save_counter = self._next_save_index()
+        
+        # 画像保存用のワーカー（JPEGエンコードとディスク書き込みを推論と並行実行）
+        self.io_executor = ThreadPoolExecutor(max_workers=1)
+        
+        # 推論スレッドのコア固定はrun()の開始時に行う（生成元スレッドの割り当ては変更しない）
+        self.cpu_pinned = False
+        self._saved_affinity = None  # (スレッドのネイティブID, 固定前のコア集合)
+    
+    @staticmethod
+    def _set_thread_affinity(cores: set) -> bool:
+        """
+        呼び出し元スレッドを指定CPUコアに固定（Linuxのみ）
+        
+        コア間のスレッド移動によるL1/L2キャッシュの無効化を防ぎます。
+        
+        Args:
+            cores: 割り当てるCPUコア番号の集合
+            
+        Returns:
+            bool: 固定できた場合True（対象外の環境では何もせずFalse）
+        """
+        # Pi 5と同じ4コア構成のLinuxでのみ適用（他の構成では割り当てを変更しない）
+        if not sys.platform.startswith("linux") or os.cpu_count() != 4:
+            return False
+        
+        try:
+            # LinuxではスレッドのネイティブIDを指定するとそのスレッドのみに適用される
+            os.sched_setaffinity(threading.get_native_id(), cores)
+            return True
+        except OSError as e:
+            print(f"警告: CPUコアの固定に失敗しました: {e}")
+            return False
+    
+    def _pin_inference_thread(self) -> None:
+        """
+        実行中のスレッド（推論スレッド）を推論用コアに固定
+        
+        固定前の割り当てを保存し、cleanup()で元に戻します。
+        """
+        try:
+            previous_cores = os.sched_getaffinity(0)
+        except (AttributeError, OSError):
+            # sched_getaffinityがない環境（macOS等）では固定しない
+            return
+        
+        if self._set_thread_affinity(self.INFERENCE_CORES):
+            self._saved_affinity = (threading.get_native_id(), previous_cores)
+            self.cpu_pinned = True
+            torch.set_num_threads(len(self.INFERENCE_CORES))
+    
+    def _restore_thread_affinity(self) -> None:
+        """_pin_inference_thread()で固定したスレッドのコア割り当てを元に戻す"""
+        if self._saved_affinity is None:
+            return
+        
+        native_id, cores = self._saved_affinity
+        self._saved_affinity = None
+        self.cpu_pinned = False
+        try:
+            os.sched_setaffinity(native_id, cores)
+        except OSError as e:
+            print(f"警告: CPUコア割り当ての復元に失敗しました: {e}")
     
     def initialize_camera(self) -> bool:
         """
@@ -101,12 +261,22 @@ class CameraDetector:
             print("カメラを初期化中...")
             
             # カメラの初期化 (インデックス0: デフォルトカメラ)
-            self.cap = cv2.VideoCapture(0)
+            # Linux(Raspberry Pi)ではV4L2バックエンドを明示的に使用
+            self.cap = cv2.VideoCapture(0, cv2.CAP_V4L2)
+            if not self.cap.isOpened():
+                # V4L2が使えない環境では既定のバックエンドで再試行
+                self.cap = cv2.VideoCapture(0)
             
             if not self.cap.isOpened():
                 print("エラー: カメラを開くことができませんでした")
                 return False
             
+            # MJPG形式で受信してUSB帯域を削減（デコードはlibjpeg-turboで高速処理）
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+            
+            # バッファを1枚にして常に最新フレームを取得（遅延の蓄積を防止）
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            
             # カメラ設定
             width, height = self.resolution
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
@@ -138,11 +308,26 @@ class CameraDetector:
         try:
             print(f"YOLOv8モデルを読み込み中: {self.model_path}")
             
+            # CPU推論向けの形式に変換済みのモデルパスを取得
+            inference_path = self._prepare_inference_model()
+            
+            # 前処理・後処理のスレッド数（コア固定時はrun()で推論用コア数に合わせる）
+            torch.set_num_threads(os.cpu_count() or 4)
+            
             # モデルの読み込み（初回実行時は自動ダウンロード）
-            self.model = YOLO(self.model_path)
+            self.model = YOLO(inference_path, task="detect")
+            
+            # ダミー画像で1回推論して推論器（predictor）を事前に構築
+            width, height = self.resolution
+            dummy_frame = np.zeros((height, width, 3), dtype=np.uint8)
+            self.model.predict(dummy_frame, conf=self.confidence, imgsz=self.imgsz,
+                               verbose=False)
+            self.predictor = self.model.predictor
             
             print("モデルの読み込みが完了しました")
-            print(f"  モデル: {self.model_path}")
+            print(f"  モデル: {inference_path}")
+            print(f"  量子化: {self.quantize}")
+            print(f"  推論サイズ: {self.imgsz}")
             print(f"  信頼度閾値: {self.confidence}")
             
             return True
@@ -151,6 +336,149 @@ class CameraDetector:
             print(f"モデル読み込み中にエラーが発生しました: {e}")
             return False
     
+    def _prepare_inference_model(self) -> str:
+        """
+        推論用モデルの準備（NCNN/OpenVINO形式への自動エクスポート）
+        
+        PyTorch形式(.pt)のままCPUで推論すると非常に遅いため、
+        初回のみエクスポートを行い、以降は変換済みモデルを再利用します。
+        入力サイズを固定（dynamic=False）してエクスポートするため、
+        imgszや精度（--quantize fp16）を変更した場合は自動的に再エクスポートされます。
+        
+        Returns:
+            str: 推論に使用するモデルのパス（失敗時は元の.ptファイル）
+        """
+        # 既に変換済みモデルが指定されている場合はそのまま使用
+        if not self.model_path.endswith(".pt"):
+            return self.model_path
+        
+        # INT8量子化はTFLite形式で別途エクスポート
+        if self.quantize == "int8":
+            return self._prepare_int8_model()
+        
+        suffix = self.EXPORT_SUFFIXES.get(self.export_format)
+        if suffix is None:
+            return self.model_path
+        
+        exported_path = os.path.splitext(self.model_path)[0] + suffix
+        if os.path.isdir(exported_path) and self._export_matches_settings(exported_path):
+            print(f"変換済みモデルを使用します: {exported_path}")
+            return exported_path
+        
+        try:
+            print(f"{self.export_format.upper()}形式へエクスポート中（初回のみ時間がかかります）...")
+            # 入力形状を固定し、形状計算の分岐を除いた最適化済みグラフを生成
+            exported_path = YOLO(self.model_path).export(
+                format=self.export_format, half=(self.quantize == "fp16"),
+                imgsz=self.imgsz, batch=1, dynamic=False, simplify=True)
+            print(f"エクスポートが完了しました: {exported_path}")
+            return str(exported_path)
+            
+        except Exception as e:
+            # エクスポートに失敗してもPyTorchモデルで動作を継続
+            print(f"警告: エクスポートに失敗したためPyTorchモデルを使用します: {e}")
+            return self.model_path
+    
+    def _export_matches_settings(self, export_dir: str) -> bool:
+        """
+        変換済みモデルの入力サイズ・精度が現在の設定と一致するかの確認
+        
+        fp16とFP32は同じディレクトリにエクスポートされるため、精度も確認します。
+        
+        Args:
+            export_dir: エクスポート先ディレクトリ（metadata.yamlを含む）
+            
+        Returns:
+            bool: 一致する場合、またはメタデータが読めない場合True
+        """
+        metadata_path = os.path.join(export_dir, "metadata.yaml")
+        try:
+            with open(metadata_path, "r", encoding="utf-8") as f:
+                metadata = yaml.safe_load(f) or {}
+        except Exception:
+            # メタデータが無い場合は従来どおり再利用
+            return True
+        
+        exported_imgsz = metadata.get("imgsz")
+        if exported_imgsz is not None and list(exported_imgsz) != [self.imgsz, self.imgsz]:
+            print(f"変換済みモデルの入力サイズ{exported_imgsz}が"
+                  f"指定値{self.imgsz}と異なるため再エクスポートします")
+            return False
+        
+        exported_half = (metadata.get("args") or {}).get("half")
+        if exported_half is not None and bool(exported_half) != (self.quantize == "fp16"):
+            print(f"変換済みモデルの精度（{'FP16' if exported_half else 'FP32'}）が"
+                  f"指定値と異なるため再エクスポートします")
+            return False
+        
+        return True
+    
+    def _prepare_int8_model(self) -> str:
+        """
+        INT8量子化TFLiteモデルの準備
+        
+        重みと演算を8bit整数にすることでメモリ転送量が半分になり、
+        ARM CPUの整数演算命令を活用して推論を高速化できます。
+        
+        Returns:
+            str: INT8モデルのパス（失敗時は元の.ptファイル）
+        """
+        base = os.path.splitext(self.model_path)[0]
+        stem = os.path.basename(base)
+        int8_path = os.path.join(f"{base}_saved_model", f"{stem}_int8.tflite")
+        
+        if (os.path.isfile(int8_path)
+                and self._export_matches_settings(os.path.dirname(int8_path))):
+            print(f"INT8量子化済みモデルを使用します: {int8_path}")
+            return int8_path
+        
+        try:
+            # キャリブレーション用データセットの準備
+            calibration_data = self._create_calibration_dataset()
+            
+            print("INT8量子化モデルへエクスポート中（初回のみ数分かかります）...")
+            exported_path = YOLO(self.model_path).export(
+                format="tflite", int8=True, data=calibration_data,
+                imgsz=self.imgsz, batch=1, dynamic=False)
+            
+            if os.path.isfile(int8_path):
+                exported_path = int8_path
+            print(f"エクスポートが完了しました: {exported_path}")
+            return str(exported_path)
+            
+        except Exception as e:
+            print(f"警告: INT8量子化に失敗したためPyTorchモデルを使用します: {e}")
+            return self.model_path
+    
+    def _create_calibration_dataset(self) -> str:
+        """
+        カメラ映像からINT8キャリブレーション用データセットを作成
+        
+        実際の設置環境の映像を使うことで、量子化による精度低下を抑えます。
+        カメラが使えない場合はUltralytics標準のcoco128を使用します。
+        
+        Returns:
+            str: データセット定義ファイル（YAML）のパス
+        """
+        if self.cap is None or not self.cap.isOpened():
+            return "coco128.yaml"
+        
+        def read_frames():
+            for _ in range(CALIBRATION_FRAMES):
+                ret, frame = self.cap.read()
+                if not ret:
+                    return
+                yield frame
+        
+        # 保存先と枚数はmodules/yolo_detector.pyと共通（追跡システムのINT8エクスポートでも同じデータを使用）
+        print(f"キャリブレーション用フレームを取得中 ({CALIBRATION_FRAMES}枚)...")
+        saved_count = save_calibration_dataset(read_frames(), self.model_path)
+        if saved_count == 0:
+            return "coco128.yaml"
+        
+        print(f"キャリブレーションデータを作成しました: {CALIBRATION_YAML} ({saved_count}枚)")
+        return CALIBRATION_YAML
+    
     def detect_pets(self, frame: np.ndarray) -> List[dict]:
         """
         フレーム内の犬猫検出
@@ -164,44 +492,128 @@ class CameraDetector:
         detection_start_time = time.time()
         
         try:
-            # YOLOv8で推論実行
-            results = self.model(frame, conf=self.confidence, verbose=False)
+            # YOLOv8で推論実行（入力サイズを縮小して計算量を削減）
+            # inference_modeで勾配計算に加えてビュー追跡・バージョン管理も無効化
+            with torch.inference_mode():
+                if self.predictor is not None:
+                    # 構築済みの推論器を直接呼び出し、毎回の設定解析を省略
+                    results = self.predictor(frame)
+                else:
+                    results = self.model(frame, conf=self.confidence, imgsz=self.imgsz,
+                                         verbose=False)
             
             detections = []
             
-            # 検出結果の解析
-            for result in results:
-                boxes = result.boxes
-                if boxes is not None:
-                    for box in boxes:
-                        # クラスID、信頼度、座標の取得
-                        class_id = int(box.cls[0])
-                        confidence = float(box.conf[0])
-                        x1, y1, x2, y2 = box.xyxy[0].tolist()
-                        
-                        # 犬または猫の場合のみ処理
-                        if class_id in [self.DOG_CLASS_ID, self.CAT_CLASS_ID]:
-                            detections.append({
-                                'class_id': class_id,
-                                'confidence': confidence,
-                                'bbox': (int(x1), int(y1), int(x2), int(y2)),
-                                'class_name': self.class_names[class_id]
-                            })
+            # 検出結果の解析（1フレーム入力のため結果は常に1件）
+            boxes = results[0].boxes
+            
+            # 全検出結果を一括でNumPy配列に変換 (N, 6): x1, y1, x2, y2, conf, cls
+            # 検出が0件でも形状(0, 6)の配列となるため分岐は不要
+            data = boxes.data.cpu().numpy()
+            class_ids = data[:, -1].astype(np.int32)
+            
+            # 犬または猫の場合のみ処理
+            mask = np.isin(class_ids, self.target_class_ids)
+            class_ids = class_ids[mask]
+            confidences = data[mask, -2]
+            bboxes = data[mask, :4].astype(np.int32)
+            
+            detections.extend(
+                {
+                    'class_id': int(class_id),
+                    'confidence': float(confidence),
+                    'bbox': (int(x1), int(y1), int(x2), int(y2)),
+                    'class_name': self.class_names[class_id]
+                }
+                for class_id, confidence, (x1, y1, x2, y2)
+                in zip(class_ids, confidences, bboxes)
+            )
             
             # 処理時間の記録
             processing_time = time.time() - detection_start_time
             self.processing_times.append(processing_time)
             
-            # 処理時間履歴の管理（最新100フレーム分のみ保持）
-            if len(self.processing_times) > 100:
-                self.processing_times.pop(0)
-            
             return detections
             
         except Exception as e:
             print(f"検出処理中にエラーが発生しました: {e}")
             return []
     
+    def _detect_or_track(self, frame: np.ndarray, frame_index: int) -> List[dict]:
+        """
+        YOLO検出とトラッカー追跡の切り替え
+        
+        ペットの動きは比較的ゆっくりなため、重いYOLO検出はNフレームに1回だけ行い、
+        間のフレームは軽量なトラッカーで位置を更新します。
+        
+        Args:
+            frame: 入力画像フレーム
+            frame_index: フレーム番号
+            
+        Returns:
+            List[dict]: 検出結果のリスト
+        """
+        if frame_index % self.detect_every == 0 or self.tracker is None:
+            detections = self.detect_pets(frame)
+            self._init_tracker(frame, detections)
+            return detections
+        
+        ok, box = self.tracker.update(frame)
+        if not ok:
+            # 追跡に失敗した場合は次のフレームで再検出
+            self.tracker = None
+            return []
+        
+        x, y, w, h = [int(v) for v in box]
+        return [dict(self.tracked_detection, bbox=(x, y, x + w, y + h))]
+    
+    def _init_tracker(self, frame: np.ndarray, detections: List[dict]) -> None:
+        """
+        最も信頼度の高い検出結果でトラッカーを初期化
+        
+        Args:
+            frame: 入力画像フレーム
+            detections: 検出結果のリスト
+        """
+        self.tracker = None
+        if not detections or self.detect_every <= 1:
+            return
+        
+        best = max(detections, key=lambda d: d['confidence'])
+        x1, y1, x2, y2 = best['bbox']
+        if x2 - x1 < 2 or y2 - y1 < 2:
+            # 画像端で潰れた検出枠ではトラッカーを初期化できないため、毎フレーム検出を続ける
+            return
+        
+        tracker = self._create_tracker()
+        if tracker is None:
+            return
+        
+        try:
+            tracker.init(frame, (x1, y1, x2 - x1, y2 - y1))
+        except Exception as e:
+            print(f"トラッカーの初期化に失敗しました（毎フレーム検出を継続）: {e}")
+            return
+        self.tracker = tracker
+        self.tracked_detection = best
+    
+    @staticmethod
+    def _create_tracker():
+        """
+        利用可能なOpenCVトラッカーの作成
+        
+        CSRT/KCFはopencv-contrib-pythonに含まれるため、
+        利用できない環境ではNone（毎フレームYOLO検出）を返します。
+        """
+        for module in (cv2, getattr(cv2, 'legacy', None)):
+            if module is None:
+                continue
+            for name in ('TrackerCSRT_create', 'TrackerKCF_create'):
+                factory = getattr(module, name, None)
+                if factory is not None:
+                    return factory()
+        return None
+    
     def draw_detections(self, frame: np.ndarray, detections: List[dict]) -> np.ndarray:
         """
         検出結果をフレームに描画
@@ -217,6 +629,11 @@ class CameraDetector:
         self.dog_count = 0
         self.cat_count = 0
         
+        # Numba使用時は矩形をまとめて描画するため、座標と色を蓄積
+        rects = []
+        rect_colors = []
+        labels = []
+        
         for detection in detections:
             class_id = detection['class_id']
             confidence = detection['confidence']
@@ -229,21 +646,44 @@ class CameraDetector:
             elif class_id == self.CAT_CLASS_ID:
                 self.cat_count += 1
             
-            # バウンディングボックスの描画
             color = self.colors[class_id]
-            cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
             
             # ラベルテキストの作成
             label = f"{class_name} {confidence:.2f}"
             
-            # ラベル背景の描画
-            (text_width, text_height), baseline = cv2.getTextSize(
-                label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
-            cv2.rectangle(frame, (x1, y1 - text_height - 10), 
-                         (x1 + text_width, y1), color, -1)
+            # ラベル文字サイズの取得（ラベルごとにキャッシュ）
+            text_size = self.label_sizes.get(label)
+            if text_size is None:
+                text_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
+                self.label_sizes[label] = text_size
+            text_width, text_height = text_size
+            
+            if NUMBA_AVAILABLE:
+                # 枠線4辺（太さ2相当）とラベル背景を塗りつぶし矩形として登録
+                rects.extend([
+                    (x1 - 1, y1 - 1, x2 + 1, y1 + 1),   # 上辺
+                    (x1 - 1, y2 - 1, x2 + 1, y2 + 1),   # 下辺
+                    (x1 - 1, y1 - 1, x1 + 1, y2 + 1),   # 左辺
+                    (x2 - 1, y1 - 1, x2 + 1, y2 + 1),   # 右辺
+                    (x1, y1 - text_height - 10, x1 + text_width, y1),  # ラベル背景
+                ])
+                rect_colors.extend([color] * 5)
+            else:
+                # バウンディングボックスとラベル背景の描画
+                cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
+                cv2.rectangle(frame, (x1, y1 - text_height - 10), 
+                             (x1 + text_width, y1), color, -1)
             
-            # ラベルテキストの描画
-            cv2.putText(frame, label, (x1, y1 - 5), 
+            labels.append((label, (x1, y1 - 5)))
+        
+        # 全検出分の矩形を1回のコンパイル済み関数呼び出しで描画
+        if rects:
+            fill_rects_numba(frame, np.array(rects, dtype=np.int32),
+                             np.array(rect_colors, dtype=np.uint8))
+        
+        # ラベルテキストの描画
+        for label, origin in labels:
+            cv2.putText(frame, label, origin, 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
         
         return frame
@@ -260,54 +700,97 @@ class CameraDetector:
         """
         height, width = frame.shape[:2]
         
-        # FPS表示
-        fps_text = f"FPS: {self.current_fps:.1f}"
-        cv2.putText(frame, fps_text, (10, 30), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-        
-        # 検出数表示
-        count_text = f"Dogs: {self.dog_count}, Cats: {self.cat_count}"
-        cv2.putText(frame, count_text, (10, 60), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-        
-        # 平均処理時間表示
-        if self.processing_times:
-            avg_time = sum(self.processing_times) / len(self.processing_times)
-            time_text = f"Avg Process Time: {avg_time*1000:.1f}ms"
-            cv2.putText(frame, time_text, (10, 90), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+        # 表示する文字列の作成（FPS・検出数・平均処理時間）
+        info_lines = [
+            f"FPS: {self.current_fps:.1f}",
+            f"Dogs: {self.dog_count}, Cats: {self.cat_count}",
+        ]
+        if self.avg_processing_time is not None:
+            info_lines.append(f"Avg Process Time: {self.avg_processing_time*1000:.1f}ms")
         
-        # 操作説明表示
-        help_text = "Press 'q' or ESC to quit, 's' to save"
-        text_size = cv2.getTextSize(help_text, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)[0]
-        cv2.putText(frame, help_text, (width - text_size[0] - 10, height - 10), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        # 文字列や画面サイズが変わったときだけHUD画像を描き直す
+        hud_key = (tuple(info_lines), width, height)
+        if hud_key != self.hud_key:
+            self._render_hud(info_lines, width, height)
+            self.hud_key = hud_key
+        
+        # 描画済みのHUDを文字部分だけフレームに転写
+        top_rows = self.hud_top.shape[0]
+        bottom_rows = self.hud_bottom.shape[0]
+        np.copyto(frame[:top_rows], self.hud_top, where=self.hud_top_mask)
+        np.copyto(frame[height - bottom_rows:], self.hud_bottom, where=self.hud_bottom_mask)
         
         return frame
     
+    def _render_hud(self, info_lines: List[str], width: int, height: int) -> None:
+        """
+        情報表示（HUD）画像の事前描画
+        
+        文字の描画は内容が変わったときだけ行い、毎フレームは
+        描画済み画像の転写のみで済ませます。
+        
+        Args:
+            info_lines: 画面左上に表示する文字列のリスト
+            width: フレーム幅
+            height: フレーム高さ
+        """
+        # 画面上部: FPS・検出数・平均処理時間
+        top_rows = min(self.HUD_TOP_ROWS, height)
+        self.hud_top = np.zeros((top_rows, width, 3), dtype=np.uint8)
+        for i, line in enumerate(info_lines):
+            cv2.putText(self.hud_top, line, (10, 30 + i * 30), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+        self.hud_top_mask = self.hud_top.any(axis=2, keepdims=True)
+        
+        # 画面下部: 操作説明（右下に配置）
+        bottom_rows = min(self.HUD_BOTTOM_ROWS, height)
+        self.hud_bottom = np.zeros((bottom_rows, width, 3), dtype=np.uint8)
+        cv2.putText(self.hud_bottom, self.help_text, 
+                   (width - self.help_text_size[0] - 10, bottom_rows - 10), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        self.hud_bottom_mask = self.hud_bottom.any(axis=2, keepdims=True)
+    
     def update_fps(self) -> None:
-        """FPS計算の更新"""
+        """FPS計算と平均処理時間の更新（1秒ごと）"""
         self.fps_counter += 1
         
         # 1秒ごとにFPSを更新
-        if time.time() - self.fps_start_time >= 1.0:
-            self.current_fps = self.fps_counter / (time.time() - self.fps_start_time)
+        now = time.time()
+        elapsed = now - self.fps_start_time
+        if elapsed >= 1.0:
+            self.current_fps = self.fps_counter / elapsed
             self.fps_counter = 0
-            self.fps_start_time = time.time()
+            self.fps_start_time = now
+            
+            # 平均処理時間も表示用に1秒ごとに再計算
+            if self.processing_times:
+                self.avg_processing_time = sum(self.processing_times) / len(self.processing_times)
+    
+    def _next_save_index(self) -> int:
+        """
+        保存ディレクトリ内の既存連番ファイルから次の番号を取得
+        
+        Returns:
+            int: 次に使用する連番
+        """
+        last_index = -1
+        with os.scandir(self.SAVE_DIR) as entries:
+            for entry in entries:
+                name, ext = os.path.splitext(entry.name)
+                number = name[len("detection_"):]
+                if name.startswith("detection_") and ext == ".jpg" and number.isdigit():
+                    last_index = max(last_index, int(number))
+        return last_index + 1
     
     def save_frame(self, frame: np.ndarray) -> None:
         """現在のフレームを画像ファイルとして保存"""
         try:
-            # 保存ディレクトリの作成
-            save_dir = "captured_frames"
-            os.makedirs(save_dir, exist_ok=True)
+            # ファイル名の生成（連番付き、連続保存でも上書きされない）
+            filename = f"{self.SAVE_DIR}/detection_{self.save_counter:06d}.jpg"
+            self.save_counter += 1
             
-            # ファイル名の生成（タイムスタンプ付き）
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{save_dir}/detection_{timestamp}.jpg"
-            
-            # 画像の保存
-            cv2.imwrite(filename, frame)
+            # 画像の保存（バックグラウンドで実行、元フレームは再利用されるためコピーを渡す）
+            self.io_executor.submit(cv2.imwrite, filename, frame.copy())
             print(f"フレームを保存しました: {filename}")
             
         except Exception as e:
@@ -320,42 +803,52 @@ class CameraDetector:
         print("="*60)
         print()
         print("操作方法:")
-        print("  'q'キー: 終了")
-        print("  's'キー: 現在のフレームを保存")
-        print("  'ESC'キー: 終了")
+        if self.headless:
+            print("  Ctrl+C: 終了（ヘッドレスモード）")
+        else:
+            print("  'q'キー: 終了")
+            print("  's'キー: 現在のフレームを保存")
+            print("  'ESC'キー: 終了")
         print()
         
+        # 推論スレッドのコア固定（カメラ取得スレッドは起動後に専用コアへ移動）
+        self._pin_inference_thread()
+        
+        # カメラ取得と画面表示を別スレッドで開始（推論と並行して動作）
+        self._start_worker_threads()
+        frame_index = 0
+        last_detection_count = 0
+        
         try:
-            while True:
-                # フレームの読み取り
-                ret, frame = self.cap.read()
-                if not ret:
-                    print("エラー: フレームを読み取れませんでした")
-                    break
+            while not self.stop_event.is_set():
+                # 最新フレームの取得（新しいフレームが届くまで待機）
+                try:
+                    frame = self.frame_queue.get(timeout=1.0)
+                except queue.Empty:
+                    continue
                 
-                # 犬猫検出の実行
-                detections = self.detect_pets(frame)
+                # 犬猫検出の実行（Nフレームに1回YOLO、それ以外はトラッカー）
+                detections = self._detect_or_track(frame, frame_index)
+                frame_index += 1
                 
-                # 検出結果の描画
-                frame = self.draw_detections(frame, detections)
-                
-                # 情報表示の描画
-                frame = self.draw_info(frame)
-                
-                # フレーム表示
-                cv2.imshow('Pet Detection Test', frame)
+                if self.headless:
+                    # ヘッドレスモード：描画・表示を省略し、検出数の変化時のみ出力
+                    if len(detections) != last_detection_count:
+                        self._log_detections(detections)
+                        last_detection_count = len(detections)
+                else:
+                    # 検出結果の描画
+                    frame = self.draw_detections(frame, detections)
+                    
+                    # 情報表示の描画
+                    frame = self.draw_info(frame)
+                    
+                    # 表示スレッドへ受け渡し
+                    self._put_latest(self.display_queue, frame)
                 
                 # FPS更新
                 self.update_fps()
                 
-                # キー入力処理
-                key = cv2.waitKey(1) & 0xFF
-                if key == ord('q') or key == 27:  # 'q'キーまたはESCキー
-                    print("\nユーザーによる終了要求を受信しました")
-                    break
-                elif key == ord('s'):  # 's'キー
-                    self.save_frame(frame)
-                
         except KeyboardInterrupt:
             print("\n\nCtrl+Cが押されました。プログラムを終了します...")
         
@@ -365,17 +858,116 @@ class CameraDetector:
         finally:
             self.cleanup()
     
+    def _start_worker_threads(self) -> None:
+        """カメラ取得スレッドと表示スレッドの開始"""
+        self.stop_event.clear()
+        
+        self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.capture_thread.start()
+        
+        # ヘッドレスモードでは表示スレッドを起動しない
+        if not self.headless:
+            self.display_thread = threading.Thread(target=self._display_loop, daemon=True)
+            self.display_thread.start()
+    
+    def _capture_loop(self) -> None:
+        """
+        カメラ取得ループ（別スレッドで実行）
+        
+        推論中もカメラ読み取りを続け、常に最新のフレームだけを保持します。
+        """
+        if self.cpu_pinned:
+            self._set_thread_affinity(self.CAPTURE_CORES)
+        
+        while not self.stop_event.is_set():
+            ret, frame = self.cap.read()
+            if not ret:
+                print("エラー: フレームを読み取れませんでした")
+                self.stop_event.set()
+                break
+            
+            self._put_latest(self.frame_queue, frame)
+    
+    def _display_loop(self) -> None:
+        """
+        画面表示とキー入力処理のループ（別スレッドで実行）
+        
+        imshowとwaitKeyは同じスレッドで呼ぶ必要があるため、まとめて処理します。
+        """
+        last_frame = None
+        
+        while not self.stop_event.is_set():
+            try:
+                last_frame = self.display_queue.get(timeout=0.03)
+                cv2.imshow('Pet Detection Test', last_frame)
+            except queue.Empty:
+                pass
+            
+            # キー入力処理
+            key = cv2.waitKey(1) & 0xFF
+            if key == ord('q') or key == 27:  # 'q'キーまたはESCキー
+                print("\nユーザーによる終了要求を受信しました")
+                self.stop_event.set()
+            elif key == ord('s') and last_frame is not None:  # 's'キー
+                self.save_frame(last_frame)
+    
+    def _log_detections(self, detections: List[dict]) -> None:
+        """
+        検出結果をコンソールに出力（ヘッドレスモード用）
+        
+        Args:
+            detections: 検出結果のリスト
+        """
+        if not detections:
+            print("検出なし")
+            return
+        
+        for detection in detections:
+            x1, y1, x2, y2 = detection['bbox']
+            center_x = (x1 + x2) // 2
+            center_y = (y1 + y2) // 2
+            print(f"検出: {detection['class_name']} "
+                  f"(信頼度: {detection['confidence']:.2f}, 中心: ({center_x}, {center_y}))")
+    
+    @staticmethod
+    def _put_latest(frame_queue: queue.Queue, frame: np.ndarray) -> None:
+        """
+        キューに最新フレームを格納（満杯時は古いフレームを破棄）
+        
+        Args:
+            frame_queue: 格納先のキュー（maxsize=1）
+            frame: 格納するフレーム
+        """
+        try:
+            frame_queue.get_nowait()
+        except queue.Empty:
+            pass
+        frame_queue.put_nowait(frame)
+    
     def cleanup(self) -> None:
         """リソースのクリーンアップ"""
         try:
             print("\nリソースをクリーンアップ中...")
             
+            # ワーカースレッドの停止
+            self.stop_event.set()
+            for thread in (self.capture_thread, self.display_thread):
+                if thread and thread.is_alive():
+                    thread.join(timeout=2.0)
+            
+            # 保存待ちの画像をすべて書き込んでから終了
+            self.io_executor.shutdown(wait=True)
+            
+            # run()で変更したコア割り当てを元に戻す
+            self._restore_thread_affinity()
+            
             if self.cap:
                 self.cap.release()
                 print("カメラリソースを解放しました")
             
-            cv2.destroyAllWindows()
-            print("OpenCVウィンドウを閉じました")
+            if not self.headless:
+                cv2.destroyAllWindows()
+                print("OpenCVウィンドウを閉じました")
             
             # 統計情報の表示
             if self.processing_times:
@@ -407,6 +999,11 @@ def parse_arguments() -> argparse.Namespace:
   python camera_detection_test.py
   python camera_detection_test.py --model yolov8s.pt --confidence 0.6
   python camera_detection_test.py --resolution 1280 720 --fps 24
+  python camera_detection_test.py --export-format openvino
+  python camera_detection_test.py --quantize int8
+  python camera_detection_test.py --imgsz 224
+  python camera_detection_test.py --detect-every 1
+  python camera_detection_test.py --headless
         """
     )
     
@@ -416,13 +1013,30 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument('--confidence', type=float, default=0.5,
                        help='検出信頼度の閾値 (0.0-1.0, デフォルト: 0.5)')
     
-    parser.add_argument('--resolution', type=int, nargs=2, default=[640, 480],
+    parser.add_argument('--resolution', type=int, nargs=2, default=[320, 240],
                        metavar=('WIDTH', 'HEIGHT'),
-                       help='カメラ解像度 (デフォルト: 640 480)')
+                       help='カメラ解像度 (デフォルト: 320 240)')
     
     parser.add_argument('--fps', type=int, default=30,
                        help='目標フレームレート (デフォルト: 30)')
     
+    parser.add_argument('--export-format', type=str, default='ncnn',
+                       choices=['ncnn', 'openvino', 'none'],
+                       help='推論用モデルのエクスポート形式 (デフォルト: ncnn、none: .ptをそのまま使用)')
+    
+    parser.add_argument('--quantize', type=str, default='none',
+                       choices=['none', 'fp16', 'int8'],
+                       help='モデルの量子化モード (デフォルト: none、int8: TFLite INT8モデルを使用)')
+    
+    parser.add_argument('--imgsz', type=int, default=320,
+                       help='推論時の入力画像サイズ (32の倍数、デフォルト: 320)')
+    
+    parser.add_argument('--detect-every', type=int, default=5,
+                       help='YOLO検出を行うフレーム間隔 (1: 毎フレーム検出、デフォルト: 5)')
+    
+    parser.add_argument('--headless', action='store_true',
+                       help='画面表示を行わずに実行（描画・imshowを省略し検出結果をコンソールに出力）')
+    
     return parser.parse_args()
 
 
@@ -449,11 +1063,24 @@ def main():
         print("エラー: FPSは正の整数で指定してください")
         sys.exit(1)
     
+    if args.imgsz <= 0 or args.imgsz % 32 != 0:
+        print("エラー: 推論サイズは32の倍数の正の整数で指定してください")
+        sys.exit(1)
+    
+    if args.detect_every <= 0:
+        print("エラー: 検出間隔は正の整数で指定してください")
+        sys.exit(1)
+    
     print(f"\n設定パラメータ:")
     print(f"  モデル: {args.model}")
     print(f"  信頼度閾値: {args.confidence}")
     print(f"  解像度: {args.resolution[0]}x{args.resolution[1]}")
     print(f"  目標FPS: {args.fps}")
+    print(f"  エクスポート形式: {args.export_format}")
+    print(f"  量子化: {args.quantize}")
+    print(f"  推論サイズ: {args.imgsz}")
+    print(f"  検出間隔: {args.detect_every}フレーム")
+    print(f"  ヘッドレス: {'有効' if args.headless else '無効'}")
     print()
     
     # CameraDetectorインスタンスの作成
@@ -461,7 +1088,12 @@ def main():
         model_path=args.model,
         confidence=args.confidence,
         resolution=tuple(args.resolution),
-        target_fps=args.fps
+        target_fps=args.fps,
+        export_format=args.export_format,
+        quantize=args.quantize,
+        imgsz=args.imgsz,
+        detect_every=args.detect_every,
+        headless=args.headless
     )
     
     try:
@@ -39,8 +39,10 @@ YOLOv8でペット（犬・猫）を検出し、Simple P制御でカメラを自
 import sys
 import signal
 import logging
+import logging.handlers
+import queue
+import atexit
 import argparse
-import time
 from datetime import datetime
 from pathlib import Path
 
@@ -77,16 +79,33 @@ class PetTrackingApp:
         self.setup_signal_handlers()
     
     def setup_logging(self):
-        """ログ設定"""
+        """
+        ログ設定
+        
+        ファイル・コンソールへの書き込みはQueueListenerの専用スレッドで行い、
+        追跡処理のスレッドがディスクI/Oで停止しないようにします。
+        ログファイルは1つに固定し、10MBごとにローテーション（3世代保持）します。
+        """
         log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        logging.basicConfig(
-            level=logging.INFO,
-            format=log_format,
-            handlers=[
-                logging.StreamHandler(sys.stdout),
-                logging.FileHandler(f'pet_tracking_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
-            ]
-        )
+        formatter = logging.Formatter(log_format)
+        
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(formatter)
+        file_handler = logging.handlers.RotatingFileHandler(
+            'pet_tracking.log', maxBytes=10_000_000, backupCount=3, encoding='utf-8')
+        file_handler.setFormatter(formatter)
+        
+        # 各スレッドはキューに積むだけにし、実際の出力はリスナースレッドで実行
+        log_queue = queue.Queue(-1)
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+        self.log_listener = logging.handlers.QueueListener(
+            log_queue, stream_handler, file_handler)
+        self.log_listener.start()
+        
+        # 終了時に未出力のログを書き出してからリスナーを停止
+        atexit.register(self.log_listener.stop)
     
     def setup_signal_handlers(self):
         """シグナルハンドラー設定"""
@@ -165,7 +184,10 @@ class PetTrackingApp:
                 image_height=args.height,
                 detection_interval=args.interval,
                 lost_target_timeout=args.timeout,
-                show_display=args.display
+                show_display=args.display,
+                model_backend=args.backend,
+                precision=args.precision,
+                detect_width=args.detect_width
             )
             
             self.logger.info("追跡システムを作成しました")
@@ -214,20 +236,21 @@ class PetTrackingApp:
             self.stop()
     
     def _status_monitoring_loop(self):
-        """ステータス監視ループ"""
-        last_status_time = 0
+        """
+        ステータス監視ループ
+        
+        一定間隔でシステム状態を表示します。待機には停止通知用のEventを使うため、
+        Ctrl+Cや'q'キーによる停止要求があれば待機中でもすぐに終了できます。
+        """
         status_interval = 10  # 10秒間隔で状態表示
         
         try:
             while self.is_running and self.tracker.is_running:
-                current_time = time.time()
-                
-                # 定期的にシステム状態を表示
-                if current_time - last_status_time > status_interval:
-                    self._print_system_status()
-                    last_status_time = current_time
+                self._print_system_status()
                 
-                time.sleep(1)
+                # 停止要求があれば即座に復帰、なければ次の表示まで待機
+                if self.tracker.stop_event.wait(timeout=status_interval):
+                    break
                 
         except KeyboardInterrupt:
             self.logger.info("監視ループが中断されました")
@@ -298,6 +321,7 @@ def parse_arguments():
   python3 main.py --no-display       # 画面表示なしで実行  
   python3 main.py --camera-id 1      # カメラID 1を使用
   python3 main.py --width 1280 --height 720  # 高解像度で実行
+  python3 main.py --backend pytorch --precision fp32  # 変換せずに元のモデルで実行
         """
     )
     
@@ -315,6 +339,14 @@ def parse_arguments():
     parser.add_argument('--timeout', type=float, default=5.0,
                       help='対象ロスト判定時間（秒） (デフォルト: 5.0)')
     
+    # 推論設定
+    parser.add_argument('--backend', choices=['auto', 'pytorch', 'onnx', 'openvino', 'tflite', 'tensorrt'],
+                      default='auto', help='YOLO推論バックエンド (デフォルト: auto)')
+    parser.add_argument('--precision', choices=['int8', 'fp16', 'fp32'],
+                      default='int8', help='YOLO推論精度、onnxはfp32（GPU使用時のみfp16） (デフォルト: int8)')
+    parser.add_argument('--detect-width', type=int, default=320,
+                      help='検出処理用に縮小する画像幅、32以上 (デフォルト: 320)')
+    
     # 表示設定
     parser.add_argument('--no-display', action='store_false', dest='display',
                       help='画面表示を無効にする')
@@ -327,7 +359,13 @@ def parse_arguments():
     parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
                       default='INFO', help='ログレベル (デフォルト: INFO)')
     
-    return parser.parse_args()
+    args = parser.parse_args()
+    
+    # 検出用の縮小幅は推論の最小入力サイズ（32pixel）以上に制限（0以下では縮小後の高さも0になる）
+    if args.detect_width < 32:
+        parser.error(f"--detect-width は32以上の整数で指定してください: {args.detect_width}")
+    
+    return args
 
 
 def main():
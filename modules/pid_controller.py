@@ -28,12 +28,20 @@ PID制御の基本原理:
 - 実機での調整は慎重に行ってください
 """
 
+import sys
+import math
 import time
 import logging
-import numpy as np
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
+
+# Numba（JITコンパイラ）はオプション：インストールされていない場合はPython実装で計算
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 
 class PIDError(Exception):
@@ -41,27 +49,111 @@ class PIDError(Exception):
     pass
 
 
-class PIDStatus(Enum):
-    """PID制御器状態の定義"""
-    UNINITIALIZED = "uninitialized"
-    READY = "ready"
-    RUNNING = "running"
-    SATURATED = "saturated"  # 出力制限に達している状態
-    ERROR = "error"
+class PIDStatus(IntEnum):
+    """PID制御器状態の定義（毎回の比較を整数比較にするためIntEnumを使用）"""
+    UNINITIALIZED = 0
+    READY = 1
+    RUNNING = 2
+    SATURATED = 3  # 出力制限に達している状態
+    ERROR = 4
+
+
+# Python 3.10以降では__slots__付きのdataclassにする（属性アクセスの高速化・省メモリ）
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class PIDState:
     """PID制御器の内部状態"""
     proportional: float = 0.0      # P項の値
     integral: float = 0.0          # I項の累積値
     derivative: float = 0.0        # D項の値
     prev_error: float = 0.0        # 前回の誤差
-    prev_time: float = 0.0         # 前回の時刻
+    prev_time_ns: int = 0          # 前回の時刻（monotonic、ナノ秒）
     output: float = 0.0            # 制御出力
     is_saturated: bool = False     # 出力飽和フラグ
 
 
+def _pid_step(error: float, prev_error: float, integral: float, delta_time: float,
+              use_derivative: bool, kP: float, kI: float, kD: float,
+              integral_min: float, integral_max: float,
+              output_min: float, output_max: float,
+              saturation_limit: float) -> Tuple[float, float, float, float, float, bool]:
+    """
+    PID制御の数値計算（1ステップ分）
+    
+    Numbaが利用可能な場合はネイティブコードにコンパイルされます。
+    
+    Args:
+        error: 今回の誤差
+        prev_error: 前回の誤差
+        integral: 前回までの誤差の積分値
+        delta_time: 前回からの経過時間（秒）
+        use_derivative: D項を計算するか（初回はFalse）
+        kP, kI, kD: PIDゲイン
+        integral_min, integral_max: 積分項制限
+        output_min, output_max: 出力制限
+        saturation_limit: 飽和判定の閾値（出力制限の絶対値の大きい方）
+        
+    Returns:
+        Tuple: (P項, 積分値, I項, D項, 制御出力, 飽和フラグ)
+    """
+    # P項の計算（現在の誤差に比例）
+    proportional = kP * error
+    
+    # I項の計算（誤差の積分、定常偏差除去）
+    if delta_time > 0:
+        integral += error * delta_time
+        
+        # 積分ワインドアップ防止（積分項制限）
+        if integral < integral_min:
+            integral = integral_min
+        elif integral > integral_max:
+            integral = integral_max
+    
+    integral_term = kI * integral
+    
+    # D項の計算（誤差の微分、オーバーシュート抑制）
+    derivative = 0.0
+    if delta_time > 0 and use_derivative:
+        derivative = kD * (error - prev_error) / delta_time
+    
+    # 制御出力の計算と出力制限の適用
+    raw_output = proportional + integral_term + derivative
+    output = raw_output
+    if output < output_min:
+        output = output_min
+    elif output > output_max:
+        output = output_max
+    
+    # 飽和状態の確認
+    is_saturated = abs(raw_output) > saturation_limit
+    
+    return proportional, integral, integral_term, derivative, output, is_saturated
+
+
+if NUMBA_AVAILABLE:
+    # 型を指定してインポート時にコンパイル（初回update時の遅延を回避し、整数引数もfloatに変換）
+    # キャッシュはモジュール名が異なる実行（単体実行など）と共有すると壊れるため使用しない
+    _pid_step = njit(
+        "Tuple((f8, f8, f8, f8, f8, b1))(f8, f8, f8, f8, b1, f8, f8, f8, f8, f8, f8, f8, f8)",
+        fastmath=True)(_pid_step)
+
+
+def _variance(values: list) -> float:
+    """
+    母分散の計算（2パス法、少数のfloat用）
+    
+    Args:
+        values: 値のリスト（1件以上）
+        
+    Returns:
+        float: 母分散
+    """
+    mean = sum(values) / len(values)
+    return sum((v - mean) * (v - mean) for v in values) / len(values)
+
+
 class PIDController:
     """
     PID制御器クラス - 追跡制御用
@@ -70,6 +162,12 @@ class PIDController:
     サーボ角度の補正値を計算するPID制御器です。
     """
     
+    # 性能履歴の保持件数（リングバッファのサイズ）
+    HISTORY_SIZE = 100
+    
+    # 平均更新時間の指数移動平均（EWMA）の平滑化係数
+    UPDATE_TIME_EWMA_ALPHA = 0.01
+    
     def __init__(self, 
                  kP: float = 1.0, 
                  kI: float = 0.0, 
@@ -96,9 +194,11 @@ class PIDController:
         self.kD = kD
         
         # 制限値
-        self.output_limits = output_limits
-        self.integral_limits = integral_limits
+        self._output_limits = tuple(output_limits)
+        self._integral_limits = tuple(integral_limits)
+        self._update_limit_args()
         self.sample_time = sample_time
+        self._sample_time_ns = int(sample_time * 1e9)  # 整数比較用（ナノ秒）
         
         # 識別情報
         self.name = name
@@ -110,117 +210,126 @@ class PIDController:
         # 性能監視
         self.update_count = 0
         self.saturation_count = 0
-        self.performance_history = []
+        
+        # 性能履歴（項目ごとの固定長リストによるリングバッファ、毎回の辞書生成を回避）
+        self._hist_timestamp = [0.0] * self.HISTORY_SIZE
+        self._hist_error = [0.0] * self.HISTORY_SIZE
+        self._hist_output = [0.0] * self.HISTORY_SIZE
+        self._hist_p = [0.0] * self.HISTORY_SIZE
+        self._hist_i = [0.0] * self.HISTORY_SIZE
+        self._hist_d = [0.0] * self.HISTORY_SIZE
+        self._hist_saturated = [False] * self.HISTORY_SIZE
+        self._hist_head = 0   # 次に書き込む位置
+        self._hist_count = 0  # 記録済みの件数
+        self._hist_version = 0  # 履歴の更新回数（統計キャッシュの無効化判定用）
+        
+        # 統計値のキャッシュ（履歴が更新されるまで再計算しない）
+        self._stable_cache = None        # (履歴バージョン, tolerance, window_size, 判定結果)
+        self._performance_cache = None   # (履歴バージョン, 直近性能の辞書)
         
         # 統計情報
         self.start_time = time.time()
         self.total_updates = 0
-        self.average_update_time = 0.0
+        self.average_update_time = 0.0  # 更新時間の指数移動平均（厳密な平均値ではない）
         
         # ログ設定
         self.logger = logging.getLogger(__name__)
         
         # 初期化完了
         self.status = PIDStatus.READY
-        self.state.prev_time = time.time()
+        self.state.prev_time_ns = time.monotonic_ns()
         
         self.logger.debug(f"PID制御器'{self.name}'を初期化: kP={kP}, kI={kI}, kD={kD}")
     
-    def update(self, error: float) -> float:
+    def update(self, error: float, now_ns: Optional[int] = None) -> float:
         """
         PID制御更新
         
         Args:
             error: 制御誤差（目標値 - 現在値）
+            now_ns: 現在時刻（time.monotonic_ns()の値、省略時は内部で取得）
             
         Returns:
             float: 制御出力（角度補正値）
+            
+        Raises:
+            TypeError, ValueError: 誤差が数値に変換できない場合
         """
         if self.status == PIDStatus.ERROR:
             self.logger.warning(f"PID制御器'{self.name}'がエラー状態です")
             return 0.0
         
-        update_start_time = time.time()
+        # 現在時刻（時刻補正の影響を受けない単調増加のナノ秒整数）
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        
+        state = self.state
+        delta_time_ns = now_ns - state.prev_time_ns
+        
+        # サンプリング時間チェック（初回は必ず実行）
+        if delta_time_ns < self._sample_time_ns and self.total_updates > 0:
+            # サンプリング時間に達していない場合は前回の出力を返す
+            return state.output
+        
+        # 誤差の妥当性は例外ではなく条件分岐で確認（NaN・無限大は内部状態を壊すため無視）
+        error = float(error)
+        if not math.isfinite(error):
+            self.logger.warning(f"PID'{self.name}': 無効な誤差値を無視しました: {error}")
+            return state.output
+        
+        self.status = PIDStatus.RUNNING
+        
+        # P・I・D各項と出力の計算（数値計算部分のみを1回の関数呼び出しで実行）
+        (proportional, integral, integral_term, derivative,
+         output, is_saturated) = _pid_step(
+            error, state.prev_error, state.integral,
+            delta_time_ns * 1e-9, self.total_updates > 0,
+            self.kP, self.kI, self.kD, *self._limit_args)
+        
+        # 状態更新
+        state.proportional = proportional
+        state.integral = integral
+        state.derivative = derivative
+        state.output = output
+        state.is_saturated = is_saturated
+        state.prev_error = error
+        state.prev_time_ns = now_ns
+        self.total_updates += 1
+        
+        # 飽和状態の確認
+        if is_saturated:
+            self.saturation_count += 1
+            self.status = PIDStatus.SATURATED
+        else:
+            self.status = PIDStatus.READY
         
-        try:
-            self.status = PIDStatus.RUNNING
-            current_time = time.time()
-            delta_time = current_time - self.state.prev_time
-            
-            # サンプリング時間チェック（初回は必ず実行）
-            if delta_time < self.sample_time and self.total_updates > 0:
-                # サンプリング時間に達していない場合は前回の出力を返す
-                return self.state.output
-            
-            # P項の計算（現在の誤差に比例）
-            self.state.proportional = self.kP * error
-            
-            # I項の計算（誤差の積分、定常偏差除去）
-            if delta_time > 0:
-                self.state.integral += error * delta_time
-                
-                # 積分ワインドアップ防止（積分項制限）
-                self.state.integral = np.clip(
-                    self.state.integral, 
-                    self.integral_limits[0], 
-                    self.integral_limits[1]
-                )
-            
-            integral_term = self.kI * self.state.integral
-            
-            # D項の計算（誤差の微分、オーバーシュート抑制）
-            if delta_time > 0 and self.total_updates > 0:
-                error_derivative = (error - self.state.prev_error) / delta_time
-                self.state.derivative = self.kD * error_derivative
-            else:
-                self.state.derivative = 0.0
-            
-            # 制御出力の計算
-            raw_output = self.state.proportional + integral_term + self.state.derivative
-            
-            # 出力制限の適用
-            self.state.output = np.clip(raw_output, self.output_limits[0], self.output_limits[1])
-            
-            # 飽和状態の確認
-            self.state.is_saturated = (abs(raw_output) > max(abs(self.output_limits[0]), abs(self.output_limits[1])))
-            if self.state.is_saturated:
-                self.saturation_count += 1
-                self.status = PIDStatus.SATURATED
-            else:
-                self.status = PIDStatus.READY
-            
-            # 状態更新
-            self.state.prev_error = error
-            self.state.prev_time = current_time
-            self.total_updates += 1
-            
-            # 性能監視
-            update_time = time.time() - update_start_time
-            self.average_update_time = ((self.average_update_time * (self.total_updates - 1)) + update_time) / self.total_updates
-            
-            # 性能履歴の記録（最新100回分）
-            self.performance_history.append({
-                'timestamp': current_time,
-                'error': error,
-                'output': self.state.output,
-                'p_term': self.state.proportional,
-                'i_term': integral_term,
-                'd_term': self.state.derivative,
-                'is_saturated': self.state.is_saturated
-            })
-            
-            if len(self.performance_history) > 100:
-                self.performance_history.pop(0)
-            
-            self.logger.debug(f"PID'{self.name}': Error={error:.2f}, Output={self.state.output:.2f}, "
-                            f"P={self.state.proportional:.2f}, I={integral_term:.2f}, D={self.state.derivative:.2f}")
-            
-            return self.state.output
-            
-        except Exception as e:
-            self.status = PIDStatus.ERROR
-            self.logger.error(f"PID制御更新中にエラー: {e}")
-            return 0.0
+        # 性能監視
+        update_time = (time.monotonic_ns() - now_ns) * 1e-9
+        if self.total_updates == 1:
+            self.average_update_time = update_time
+        else:
+            self.average_update_time += self.UPDATE_TIME_EWMA_ALPHA * (update_time - self.average_update_time)
+        
+        # 性能履歴の記録（最新100回分、古い値は上書き）
+        head = self._hist_head
+        self._hist_timestamp[head] = now_ns * 1e-9  # monotonic秒
+        self._hist_error[head] = error
+        self._hist_output[head] = output
+        self._hist_p[head] = proportional
+        self._hist_i[head] = integral_term
+        self._hist_d[head] = derivative
+        self._hist_saturated[head] = is_saturated
+        self._hist_head = (head + 1) % self.HISTORY_SIZE
+        if self._hist_count < self.HISTORY_SIZE:
+            self._hist_count += 1
+        self._hist_version += 1
+        
+        # DEBUGレベルが無効な場合は文字列の組み立て自体を省略
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("PID'%s': Error=%.2f, Output=%.2f, P=%.2f, I=%.2f, D=%.2f",
+                              self.name, error, output, proportional, integral_term, derivative)
+        
+        return output
     
     def reset(self) -> None:
         """PID内部状態のリセット"""
@@ -233,16 +342,69 @@ class PIDController:
         self.state.prev_error = 0.0
         self.state.output = 0.0
         self.state.is_saturated = False
-        self.state.prev_time = time.time()
+        self.state.prev_time_ns = time.monotonic_ns()
         
         # 統計情報のリセット
         self.saturation_count = 0
-        self.performance_history.clear()
+        self._clear_history()
         
         # ステータスを準備完了に変更
         if self.status != PIDStatus.ERROR:
             self.status = PIDStatus.READY
     
+    def _clear_history(self) -> None:
+        """性能履歴のクリア（リストは再利用）"""
+        self._hist_head = 0
+        self._hist_count = 0
+        self._hist_version += 1
+    
+    def _recent(self, values: list, count: int) -> list:
+        """
+        リングバッファから直近の履歴を古い順に取得
+        
+        Args:
+            values: 履歴リスト（_hist_*のいずれか）
+            count: 取得する件数（記録済み件数が上限）
+            
+        Returns:
+            list: 直近count件の値
+        """
+        count = min(count, self._hist_count)
+        start = self._hist_head - count
+        if start >= 0:
+            return values[start:self._hist_head]
+        # リストの末尾から先頭へ折り返している場合は2区間を連結
+        return values[start:] + values[:self._hist_head]
+    
+    @property
+    def performance_history(self) -> List[Dict]:
+        """
+        性能履歴の取得（古い順、互換性のため辞書のリストで返す）
+        
+        Returns:
+            List[Dict]: 各更新時の誤差・出力・各項の値
+        """
+        count = self.HISTORY_SIZE
+        return [
+            {
+                'timestamp': timestamp,
+                'error': error,
+                'output': output,
+                'p_term': p_term,
+                'i_term': i_term,
+                'd_term': d_term,
+                'is_saturated': is_saturated
+            }
+            for timestamp, error, output, p_term, i_term, d_term, is_saturated in zip(
+                self._recent(self._hist_timestamp, count),
+                self._recent(self._hist_error, count),
+                self._recent(self._hist_output, count),
+                self._recent(self._hist_p, count),
+                self._recent(self._hist_i, count),
+                self._recent(self._hist_d, count),
+                self._recent(self._hist_saturated, count))
+        ]
+    
     def set_parameters(self, kP: float, kI: float, kD: float) -> None:
         """
         PIDパラメータの動的変更
@@ -262,6 +424,40 @@ class PIDController:
                         f"({old_params[0]:.3f}, {old_params[1]:.3f}, {old_params[2]:.3f}) -> "
                         f"({kP:.3f}, {kI:.3f}, {kD:.3f})")
     
+    @property
+    def output_limits(self) -> Tuple[float, float]:
+        """出力制限（最小, 最大）"""
+        return self._output_limits
+    
+    @output_limits.setter
+    def output_limits(self, limits: Tuple[float, float]) -> None:
+        self._output_limits = tuple(limits)
+        self._update_limit_args()
+    
+    @property
+    def integral_limits(self) -> Tuple[float, float]:
+        """積分項制限（最小, 最大）"""
+        return self._integral_limits
+    
+    @integral_limits.setter
+    def integral_limits(self, limits: Tuple[float, float]) -> None:
+        self._integral_limits = tuple(limits)
+        self._update_limit_args()
+    
+    def _update_limit_args(self) -> None:
+        """
+        制限値から計算カーネル用の引数を事前計算（制限値の変更時のみ）
+        
+        飽和判定の閾値など、制限値だけで決まる値を毎回のupdate()で計算しないようにします。
+        """
+        integral_min, integral_max = self._integral_limits
+        output_min, output_max = self._output_limits
+        self._limit_args = (
+            float(integral_min), float(integral_max),
+            float(output_min), float(output_max),
+            float(max(abs(output_min), abs(output_max)))
+        )
+    
     def set_output_limits(self, min_output: float, max_output: float) -> None:
         """
         出力制限の設定
@@ -334,13 +530,19 @@ class PIDController:
         Returns:
             bool: 安定している場合True
         """
-        if len(self.performance_history) < window_size:
+        if self._hist_count < window_size:
             return False
         
-        recent_outputs = [p['output'] for p in self.performance_history[-window_size:]]
-        output_variance = np.var(recent_outputs)
+        # 履歴が前回判定時から変わっていなければ結果を再利用
+        cache = self._stable_cache
+        if cache is not None and cache[:3] == (self._hist_version, tolerance, window_size):
+            return cache[3]
+        
+        output_variance = _variance(self._recent(self._hist_output, window_size))
+        stable = bool(output_variance < tolerance)
+        self._stable_cache = (self._hist_version, tolerance, window_size, stable)
         
-        return output_variance < tolerance
+        return stable
     
     def get_performance_statistics(self) -> Dict:
         """
@@ -349,30 +551,45 @@ class PIDController:
         Returns:
             Dict: 性能統計情報
         """
-        if not self.performance_history:
+        if self._hist_count == 0:
             return {}
         
-        recent_errors = [p['error'] for p in self.performance_history[-50:]]
-        recent_outputs = [p['output'] for p in self.performance_history[-50:]]
         saturation_rate = self.saturation_count / max(self.total_updates, 1)
         
         stats = {
             'name': self.name,
             'parameters': self.get_parameters(),
             'total_updates': self.total_updates,
-            'average_update_time': self.average_update_time * 1000,  # ms
+            'average_update_time': self.average_update_time * 1000,  # ms（指数移動平均）
             'saturation_rate': saturation_rate,
-            'current_status': self.status.value,
-            'recent_performance': {
-                'mean_error': np.mean(np.abs(recent_errors)) if recent_errors else 0,
-                'mean_output': np.mean(recent_outputs) if recent_outputs else 0,
-                'output_variance': np.var(recent_outputs) if recent_outputs else 0,
-                'is_stable': self.is_stable()
-            }
+            'current_status': self.status.name.lower(),
+            'recent_performance': self._recent_performance()
         }
         
         return stats
     
+    def _recent_performance(self) -> Dict:
+        """
+        直近50回分の性能統計（履歴が更新された場合のみ再計算）
+        
+        Returns:
+            Dict: 平均誤差・平均出力・出力分散・安定性
+        """
+        cache = self._performance_cache
+        if cache is None or cache[0] != self._hist_version:
+            recent_errors = self._recent(self._hist_error, 50)
+            recent_outputs = self._recent(self._hist_output, 50)
+            performance = {
+                'mean_error': sum(map(abs, recent_errors)) / len(recent_errors),
+                'mean_output': sum(recent_outputs) / len(recent_outputs),
+                'output_variance': _variance(recent_outputs),
+                'is_stable': self.is_stable()
+            }
+            cache = self._performance_cache = (self._hist_version, performance)
+        
+        # 呼び出し側での変更がキャッシュに影響しないようコピーを返す
+        return dict(cache[1])
+    
     def get_status(self) -> PIDStatus:
         """ステータス取得"""
         return self.status
@@ -393,7 +610,7 @@ class PIDController:
                     self.logger.warning(f"PID'{self.name}'統計情報取得エラー: {e}")
             
             # 状態のクリア
-            self.performance_history.clear()
+            self._clear_history()
             self.status = PIDStatus.UNINITIALIZED
             
             self.logger.info(f"PID制御器'{self.name}'のクリーンアップが完了しました")
@@ -457,8 +674,16 @@ class DualPIDController:
         Returns:
             Tuple[float, float]: (pan_output, tilt_output) 制御出力
         """
-        pan_output = self.pan_pid.update(pan_error)
-        tilt_output = self.tilt_pid.update(tilt_error)
+        # 時刻は1回だけ取得して両軸で共有（同じ時刻で両軸の経過時間を計算）
+        now_ns = time.monotonic_ns()
+        
+        # 例外処理は各軸の制御計算の外側（この呼び出し境界）でまとめて行う
+        try:
+            pan_output = self.pan_pid.update(pan_error, now_ns)
+            tilt_output = self.tilt_pid.update(tilt_error, now_ns)
+        except Exception as e:
+            self.logger.error(f"デュアルPID制御更新中にエラー: {e}")
+            return (0.0, 0.0)
         
         return (pan_output, tilt_output)
     
@@ -20,9 +20,11 @@ SG90サーボモータによるパン・チルト機構を制御します。
 
 import time
 import sys
+import struct
 import logging
+import threading
 from typing import Optional, Tuple
-from enum import Enum
+from enum import IntEnum
 
 try:
     import board
@@ -41,13 +43,17 @@ class ServoControllerError(Exception):
     pass
 
 
-class ServoStatus(Enum):
-    """サーボ状態の定義"""
-    UNINITIALIZED = "uninitialized"
-    INITIALIZING = "initializing"
-    READY = "ready"
-    MOVING = "moving"
-    ERROR = "error"
+class ServoStatus(IntEnum):
+    """サーボ状態の定義（毎回の比較を整数比較にするためIntEnumを使用）"""
+    UNINITIALIZED = 0
+    INITIALIZING = 1
+    READY = 2
+    MOVING = 3
+    ERROR = 4
+
+
+# 準備状態チェック用の定数（毎回の列挙型メンバー参照を省略）
+_SERVO_READY = ServoStatus.READY
 
 
 class ServoController:
@@ -58,6 +64,20 @@ class ServoController:
     追跡システムで使用するための高精度制御機能を提供します。
     """
     
+    # サーボのパルス幅設定（adafruit_motor.servoの既定値と同じ）
+    SERVO_MIN_PULSE = 750         # 最小パルス幅（μs）
+    SERVO_MAX_PULSE = 2250        # 最大パルス幅（μs）
+    SERVO_ACTUATION_RANGE = 180   # サーボ角度の範囲（度）
+    
+    # 角度→デューティ比テーブルの分解能（1度あたりの分割数）
+    DUTY_LUT_STEPS_PER_DEGREE = 10
+    
+    # PCA9685のレジスタ（チャンネル0のLED0_ON_L、以降1チャンネルあたり4バイト）
+    PCA9685_LED0_ON_L = 0x06
+    # 全チャンネル一括のALL_LED_OFF_Hレジスタと、その完全OFFビット（bit 4）
+    PCA9685_ALL_LED_OFF_H = 0xFD
+    PCA9685_FULL_OFF = 0x10
+    
     def __init__(self, 
                  i2c_address: int = 0x40,
                  pwm_frequency: int = 50,
@@ -91,6 +111,11 @@ class ServoController:
         self.pca = None
         self.pan_servo = None
         self.tilt_servo = None
+        self.pan_pwm = None   # パンサーボのPWMチャンネル（デューティ比の直接書き込み用）
+        self.tilt_pwm = None  # チルトサーボのPWMチャンネル
+        self.duty_lut = None  # サーボ角度（0.1度刻み）→デューティ比の変換テーブル
+        self.register_lut = None  # 同じ刻みでのLEDn_ON/OFFレジスタ値（4バイト）
+        self.burst_register = None  # パン・チルト一括書き込みの先頭レジスタ（隣接チャンネル時のみ）
         
         # 現在角度の記録（追跡用）
         self.current_pan_angle = 0.0
@@ -102,6 +127,20 @@ class ServoController:
         # 動作パラメータ
         self.move_speed = 0.5  # 動作速度（秒）
         self.settle_time = 0.1  # 安定待機時間（秒）
+        self.command_interval = 0.02  # 目標角度の最小書き込み間隔（秒、50HzのPWM周期）
+        self.angle_epsilon = 0.5  # この角度差（度）未満の指令は書き込みを省略（SG90の分解能は約1度）
+        
+        # 目標角度の書き込みスレッド（最新の目標のみを保持し、古い目標は破棄）
+        self._target = None
+        self._target_lock = threading.Lock()
+        self._target_event = threading.Event()
+        self._command_thread = None
+        self._command_running = False
+        
+        # サーボへの書き込みと現在角度の更新を一体で行うためのロック
+        # （書き込みスレッドの古い目標が直接指定した角度や緊急停止を上書きしないようにする）
+        # 書き込み中にシグナルハンドラから緊急停止しても固まらないよう再入可能にする
+        self._write_lock = threading.RLock()
         
         # ログ設定
         self.logger = logging.getLogger(__name__)
@@ -125,8 +164,23 @@ class ServoController:
             self.pca.frequency = self.pwm_frequency
             
             # サーボモータの初期化
-            self.pan_servo = servo.Servo(self.pca.channels[self.pan_channel])
-            self.tilt_servo = servo.Servo(self.pca.channels[self.tilt_channel])
+            self.pan_pwm = self.pca.channels[self.pan_channel]
+            self.tilt_pwm = self.pca.channels[self.tilt_channel]
+            self.pan_servo = servo.Servo(
+                self.pan_pwm, actuation_range=self.SERVO_ACTUATION_RANGE,
+                min_pulse=self.SERVO_MIN_PULSE, max_pulse=self.SERVO_MAX_PULSE)
+            self.tilt_servo = servo.Servo(
+                self.tilt_pwm, actuation_range=self.SERVO_ACTUATION_RANGE,
+                min_pulse=self.SERVO_MIN_PULSE, max_pulse=self.SERVO_MAX_PULSE)
+            
+            # 角度→デューティ比の変換テーブルを事前計算（毎回の浮動小数点計算を省略）
+            self.duty_lut = self._build_duty_lut(self.pca.frequency)
+            self.register_lut = [self._duty_to_register_bytes(duty) for duty in self.duty_lut]
+            
+            # パン・チルトが隣接チャンネルの場合は1回のI2C転送で両方を書き込む
+            if abs(self.pan_channel - self.tilt_channel) == 1:
+                self.burst_register = (self.PCA9685_LED0_ON_L
+                                       + 4 * min(self.pan_channel, self.tilt_channel))
             
             # 中央位置に移動（追跡システムの基準位置）
             self.logger.info("サーボを中央位置に設定中...")
@@ -137,6 +191,9 @@ class ServoController:
             self.current_tilt_angle = 0.0
             self.status = ServoStatus.READY
             
+            # 目標角度の書き込みスレッドを開始
+            self._start_command_thread()
+            
             self.logger.info("サーボドライバの初期化が完了しました")
             return True
             
@@ -145,12 +202,13 @@ class ServoController:
             self.logger.error(f"サーボドライバの初期化に失敗しました: {e}")
             return False
     
-    def set_pan_angle(self, angle: float) -> bool:
+    def set_pan_angle(self, angle: float, wait: bool = True) -> bool:
         """
         パン角度設定
         
         Args:
             angle: パン角度（度）-90°～+90°
+            wait: Trueの場合はサーボの安定待機（settle_time）を行う
             
         Returns:
             bool: 設定成功時True、失敗時False
@@ -163,14 +221,25 @@ class ServoController:
             return False
         
         try:
-            self.status = ServoStatus.MOVING
             servo_angle = self._pan_angle_to_servo(angle)
-            self.pan_servo.angle = servo_angle
-            self.current_pan_angle = angle
-            time.sleep(self.settle_time)
-            self.status = ServoStatus.READY
+            with self._write_lock:
+                self._discard_target()  # 直接指定した角度を優先（未書き込みの目標は破棄）
+                if self._outputs_stopped():  # 待機中に緊急停止・解放された場合は書き込まない
+                    return False
+                
+                # 現在角度とほぼ同じ場合はI2C書き込みと安定待機を省略
+                if abs(angle - self.current_pan_angle) < self.angle_epsilon:
+                    return True
+                
+                self.status = ServoStatus.MOVING
+                self.pan_pwm.duty_cycle = self._servo_angle_to_duty(servo_angle)
+                self.current_pan_angle = angle
+            if wait:
+                time.sleep(self.settle_time)
+            self._finish_move()
             
-            self.logger.debug(f"パン角度を設定: {angle}度 (サーボ角度: {servo_angle}度)")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("パン角度を設定: %s度 (サーボ角度: %s度)", angle, servo_angle)
             return True
             
         except Exception as e:
@@ -178,12 +247,13 @@ class ServoController:
             self.logger.error(f"パン角度設定中にエラー: {e}")
             return False
     
-    def set_tilt_angle(self, angle: float) -> bool:
+    def set_tilt_angle(self, angle: float, wait: bool = True) -> bool:
         """
         チルト角度設定
         
         Args:
             angle: チルト角度（度）-45°～+45°
+            wait: Trueの場合はサーボの安定待機（settle_time）を行う
             
         Returns:
             bool: 設定成功時True、失敗時False
@@ -196,14 +266,25 @@ class ServoController:
             return False
         
         try:
-            self.status = ServoStatus.MOVING
             servo_angle = self._tilt_angle_to_servo(angle)
-            self.tilt_servo.angle = servo_angle
-            self.current_tilt_angle = angle
-            time.sleep(self.settle_time)
-            self.status = ServoStatus.READY
+            with self._write_lock:
+                self._discard_target()  # 直接指定した角度を優先（未書き込みの目標は破棄）
+                if self._outputs_stopped():  # 待機中に緊急停止・解放された場合は書き込まない
+                    return False
+                
+                # 現在角度とほぼ同じ場合はI2C書き込みと安定待機を省略
+                if abs(angle - self.current_tilt_angle) < self.angle_epsilon:
+                    return True
+                
+                self.status = ServoStatus.MOVING
+                self.tilt_pwm.duty_cycle = self._servo_angle_to_duty(servo_angle)
+                self.current_tilt_angle = angle
+            if wait:
+                time.sleep(self.settle_time)
+            self._finish_move()
             
-            self.logger.debug(f"チルト角度を設定: {angle}度 (サーボ角度: {servo_angle}度)")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("チルト角度を設定: %s度 (サーボ角度: %s度)", angle, servo_angle)
             return True
             
         except Exception as e:
@@ -211,13 +292,17 @@ class ServoController:
             self.logger.error(f"チルト角度設定中にエラー: {e}")
             return False
     
-    def set_angles(self, pan_angle: float, tilt_angle: float) -> bool:
+    def set_angles(self, pan_angle: float, tilt_angle: float, wait: bool = True) -> bool:
         """
         パン・チルト同時設定
         
+        追跡ループから呼ぶ場合はwait=Falseを指定し、サーボの移動と
+        次フレームの取得・検出を並行させてください。
+        
         Args:
             pan_angle: パン角度（度）
             tilt_angle: チルト角度（度）
+            wait: Trueの場合はサーボの安定待機（settle_time）を行う
             
         Returns:
             bool: 設定成功時True、失敗時False
@@ -230,14 +315,26 @@ class ServoController:
             return False
         
         try:
-            self.status = ServoStatus.MOVING
-            self._set_servo_angles(pan_angle, tilt_angle)
-            self.current_pan_angle = pan_angle
-            self.current_tilt_angle = tilt_angle
-            time.sleep(self.settle_time)
-            self.status = ServoStatus.READY
+            with self._write_lock:
+                self._discard_target()  # 直接指定した角度を優先（未書き込みの目標は破棄）
+                
+                if self._outputs_stopped():  # 待機中に緊急停止・解放された場合は書き込まない
+                    return False
+                
+                # 両軸とも現在角度とほぼ同じ場合はI2C書き込みと安定待機を省略
+                if self._is_near_current(pan_angle, tilt_angle):
+                    return True
+                
+                self.status = ServoStatus.MOVING
+                self._set_servo_angles(pan_angle, tilt_angle)
+                self.current_pan_angle = pan_angle
+                self.current_tilt_angle = tilt_angle
+            if wait:
+                time.sleep(self.settle_time)
+            self._finish_move()
             
-            self.logger.debug(f"角度を同時設定: Pan={pan_angle}度, Tilt={tilt_angle}度")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("角度を同時設定: Pan=%s度, Tilt=%s度", pan_angle, tilt_angle)
             return True
             
         except Exception as e:
@@ -245,6 +342,41 @@ class ServoController:
             self.logger.error(f"角度同時設定中にエラー: {e}")
             return False
     
+    def set_target(self, pan_angle: float, tilt_angle: float) -> bool:
+        """
+        目標角度の設定（非ブロッキング）
+        
+        書き込みスレッドがcommand_intervalごとに最新の目標角度だけを書き込むため、
+        追跡ループがサーボの応答より速く目標を更新しても余分なI2C通信は発生しません。
+        書き込みスレッドが動作していない場合はset_angles(wait=False)で直接書き込みます。
+        
+        Args:
+            pan_angle: パン角度（度）
+            tilt_angle: チルト角度（度）
+            
+        Returns:
+            bool: 目標を受け付けた場合True、失敗時False
+        """
+        # set_angles等の安定待機中は、制御周期ごとに警告を出さずに受け付けない
+        if self.status == ServoStatus.MOVING:
+            return False
+        
+        if not self._command_running:
+            return self.set_angles(pan_angle, tilt_angle, wait=False)
+        
+        if not self._is_ready():
+            return False
+        
+        if not self.is_angle_safe(pan_angle, tilt_angle):
+            self.logger.warning(f"角度が安全範囲外です: Pan={pan_angle}度, Tilt={tilt_angle}度")
+            return False
+        
+        # 未書き込みの目標があれば上書き（最新の目標のみ保持）
+        with self._target_lock:
+            self._target = (pan_angle, tilt_angle)
+        self._target_event.set()
+        return True
+    
     def get_current_angles(self) -> Tuple[float, float]:
         """
         現在の角度取得
@@ -324,11 +456,17 @@ class ServoController:
         """緊急停止"""
         try:
             self.logger.warning("緊急停止を実行中...")
-            self.status = ServoStatus.ERROR
             
-            # 中央位置に緊急移動
-            if self.pan_servo and self.tilt_servo:
-                self._set_servo_angles(0.0, 0.0)
+            # 書き込みスレッドを止め、書き込み途中の目標があれば完了を待ってから出力を停止
+            # （停止後にチャンネルへ書き込まれると完全OFFが解除されてサーボが再び動くため）
+            self._stop_command_thread()
+            with self._write_lock:
+                self.status = ServoStatus.ERROR
+                self._discard_target()
+                
+                # 全チャンネルのPWM出力を1回のI2C書き込みで同時に停止
+                if self.pca:
+                    self._all_outputs_off()
             
             self.logger.warning("緊急停止が完了しました")
             
@@ -341,18 +479,21 @@ class ServoController:
             if self.status != ServoStatus.UNINITIALIZED:
                 self.logger.info("サーボドライバをクリーンアップ中...")
                 
+                # 書き込みスレッドの停止
+                self._stop_command_thread()
+                
                 # 中央位置に復帰
                 if self.pan_servo and self.tilt_servo:
-                    self._set_servo_angles(0.0, 0.0)
+                    with self._write_lock:
+                        self._set_servo_angles(0.0, 0.0)
                     time.sleep(1.0)
                 
-                # PWM出力を停止
-                if self.pca:
-                    for channel in self.pca.channels:
-                        channel.duty_cycle = 0
-                    self.pca.deinit()
-                
-                self.status = ServoStatus.UNINITIALIZED
+                # PWM出力を停止（停止後に他のスレッドから書き込まれないよう状態変更までロック内で行う）
+                with self._write_lock:
+                    if self.pca:
+                        self._all_outputs_off()
+                        self.pca.deinit()
+                    self.status = ServoStatus.UNINITIALIZED
                 self.logger.info("サーボドライバのクリーンアップが完了しました")
                 
         except Exception as e:
@@ -370,15 +511,91 @@ class ServoController:
         else:
             self.logger.warning(f"動作速度が範囲外です: {speed}")
     
+    def set_angle_epsilon(self, epsilon: float) -> None:
+        """書き込みを省略する角度差の設定（0で省略なし）"""
+        if 0.0 <= epsilon <= 5.0:
+            self.angle_epsilon = epsilon
+            self.logger.debug(f"書き込み省略の角度差を設定: {epsilon}度")
+        else:
+            self.logger.warning(f"書き込み省略の角度差が範囲外です: {epsilon}")
+    
     # プライベートメソッド
     
+    def _start_command_thread(self) -> None:
+        """目標角度の書き込みスレッドを開始"""
+        self._command_running = True
+        self._command_thread = threading.Thread(target=self._command_loop, daemon=True)
+        self._command_thread.start()
+    
+    def _stop_command_thread(self) -> None:
+        """目標角度の書き込みスレッドを停止"""
+        self._command_running = False
+        self._target_event.set()
+        if self._command_thread and self._command_thread.is_alive():
+            self._command_thread.join(timeout=1.0)
+        self._command_thread = None
+    
+    def _discard_target(self) -> None:
+        """未書き込みの目標角度を破棄"""
+        with self._target_lock:
+            self._target = None
+    
+    def _command_loop(self) -> None:
+        """
+        目標角度の書き込みループ（別スレッドで実行）
+        
+        書き込み後はcommand_intervalだけ待機し、その間に届いた目標は最新の1件にまとめます。
+        """
+        while self._command_running:
+            self._target_event.wait()
+            
+            # 目標の取り出しから書き込みまでを書き込みロック内で行い、
+            # その間にset_angles等で直接指定された角度が古い目標で上書きされないようにする
+            with self._write_lock:
+                with self._target_lock:
+                    target = self._target
+                    self._target = None
+                    self._target_event.clear()
+                
+                # 停止中・エラー状態（緊急停止後など）では書き込まない
+                if target is None or not self._command_running or self._outputs_stopped():
+                    continue
+                
+                # 最後に書き込んだ角度とほぼ同じ目標は書き込みを省略
+                if self._is_near_current(*target):
+                    continue
+                
+                try:
+                    self._set_servo_angles(*target)
+                    self.current_pan_angle, self.current_tilt_angle = target
+                except Exception as e:
+                    self.status = ServoStatus.ERROR
+                    self.logger.error(f"目標角度の書き込み中にエラー: {e}")
+            
+            time.sleep(self.command_interval)
+    
+    def _outputs_stopped(self) -> bool:
+        """PWM出力を停止済みか（緊急停止後・解放後はチャンネルへ書き込まない）"""
+        return self.status in (ServoStatus.ERROR, ServoStatus.UNINITIALIZED)
+    
+    def _finish_move(self) -> None:
+        """移動完了（安定待機中に緊急停止された場合はERRORのまま）"""
+        with self._write_lock:
+            if self.status == ServoStatus.MOVING:
+                self.status = ServoStatus.READY
+    
     def _is_ready(self) -> bool:
         """準備状態チェック"""
-        if self.status != ServoStatus.READY:
-            self.logger.warning(f"サーボが準備状態ではありません: {self.status}")
+        if self.status != _SERVO_READY:
+            self.logger.warning(f"サーボが準備状態ではありません: {self.status.name}")
             return False
         return True
     
+    def _is_near_current(self, pan_angle: float, tilt_angle: float) -> bool:
+        """現在角度（最後に書き込んだ角度）との差が両軸ともangle_epsilon未満か"""
+        return (abs(pan_angle - self.current_pan_angle) < self.angle_epsilon and
+                abs(tilt_angle - self.current_tilt_angle) < self.angle_epsilon)
+    
     def _is_pan_angle_safe(self, angle: float) -> bool:
         """パン角度安全性チェック"""
         return self.pan_min <= angle <= self.pan_max
@@ -401,13 +618,97 @@ class ServoController:
         """
         return angle + 90.0  # -45°～+45° → 45°～135°
     
+    def _build_duty_lut(self, frequency: float) -> list:
+        """
+        サーボ角度→デューティ比の変換テーブル作成
+        
+        adafruit_motor.servoと同じ計算式で、0〜180度を0.1度刻みで事前計算します。
+        
+        Args:
+            frequency: PCA9685の実際のPWM周波数（Hz）
+            
+        Returns:
+            list: デューティ比（16bit）のリスト
+        """
+        min_duty = int((self.SERVO_MIN_PULSE * frequency) / 1000000 * 0xFFFF)
+        max_duty = (self.SERVO_MAX_PULSE * frequency) / 1000000 * 0xFFFF
+        duty_range = int(max_duty - min_duty)
+        
+        steps = self.SERVO_ACTUATION_RANGE * self.DUTY_LUT_STEPS_PER_DEGREE
+        return [min_duty + int(step / steps * duty_range) for step in range(steps + 1)]
+    
+    @staticmethod
+    def _duty_to_register_bytes(duty: int) -> bytes:
+        """
+        デューティ比（16bit）をLEDn_ON_L〜LEDn_OFF_Hの4バイトに変換
+        
+        adafruit_pca9685のduty_cycle設定と同じく、上位12bitをOFFカウントとして使用します。
+        """
+        if duty == 0xFFFF:
+            return struct.pack("<HH", 0x1000, 0)  # 常時ON
+        return struct.pack("<HH", 0, (duty + 1) >> 4)
+    
+    def _servo_angle_to_index(self, servo_angle: float) -> int:
+        """
+        サーボ角度を変換テーブルのインデックスに変換
+        
+        Args:
+            servo_angle: サーボ座標系の角度（0°～180°）
+            
+        Returns:
+            int: テーブルのインデックス（範囲外は端の値に制限）
+        """
+        index = int(servo_angle * self.DUTY_LUT_STEPS_PER_DEGREE + 0.5)
+        if index < 0:
+            return 0
+        if index >= len(self.duty_lut):
+            return len(self.duty_lut) - 1
+        return index
+    
+    def _servo_angle_to_duty(self, servo_angle: float) -> int:
+        """
+        サーボ角度をデューティ比に変換（変換テーブル参照）
+        
+        Args:
+            servo_angle: サーボ座標系の角度（0°～180°）
+            
+        Returns:
+            int: デューティ比（16bit）
+        """
+        return self.duty_lut[self._servo_angle_to_index(servo_angle)]
+    
     def _set_servo_angles(self, pan_angle: float, tilt_angle: float) -> None:
         """サーボ角度の直接設定（内部使用）"""
-        pan_servo_angle = self._pan_angle_to_servo(pan_angle)
-        tilt_servo_angle = self._tilt_angle_to_servo(tilt_angle)
+        pan_index = self._servo_angle_to_index(self._pan_angle_to_servo(pan_angle))
+        tilt_index = self._servo_angle_to_index(self._tilt_angle_to_servo(tilt_angle))
+        
+        if self.burst_register is None:
+            # 隣接していないチャンネルは個別に書き込み
+            self.pan_pwm.duty_cycle = self.duty_lut[pan_index]
+            self.tilt_pwm.duty_cycle = self.duty_lut[tilt_index]
+            return
         
-        self.pan_servo.angle = pan_servo_angle
-        self.tilt_servo.angle = tilt_servo_angle
+        # 隣接チャンネルは自動インクリメントを利用して8バイトを1回のI2C転送で書き込み
+        pan_bytes = self.register_lut[pan_index]
+        tilt_bytes = self.register_lut[tilt_index]
+        if self.pan_channel < self.tilt_channel:
+            payload = bytes((self.burst_register,)) + pan_bytes + tilt_bytes
+        else:
+            payload = bytes((self.burst_register,)) + tilt_bytes + pan_bytes
+        
+        with self.pca.i2c_device as i2c:
+            i2c.write(payload)
+    
+    def _all_outputs_off(self) -> None:
+        """
+        全チャンネルのPWM出力を停止（内部使用）
+        
+        ALL_LED_OFF_Hの完全OFFビットで16チャンネルを同時にLOWにします。
+        各チャンネルのOFF_Hへ次に書き込んだ時点で解除されるため、_write_lockを保持し、
+        ロックを離す前に書き込みが行われない状態（ERROR・UNINITIALIZED）にしてから呼び出してください。
+        """
+        with self.pca.i2c_device as i2c:
+            i2c.write(bytes((self.PCA9685_ALL_LED_OFF_H, self.PCA9685_FULL_OFF)))
 
 
 # 旧形式との互換性のためのエイリアス
@@ -23,12 +23,25 @@ Simple P制御は比例項のみを使用する制御方式で、
 多くのパン・チルト追跡システムで成功している実証済みアプローチです。
 """
 
+import os
+import sys
 import time
 import logging
 import numpy as np
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
+from multiprocessing.sharedctypes import SynchronizedArray
+
+# Numba（JITコンパイラ）はオプション：インストールされていない場合はPython実装で計算
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# モジュール共通のロガー（インスタンスごとの取得・保持を省略）
+logger = logging.getLogger(__name__)
 
 
 class SimplePError(Exception):
@@ -44,13 +57,92 @@ class SimplePStatus(Enum):
     ERROR = "error"
 
 
-@dataclass
+# Python 3.10以降では__slots__付きのdataclassにする（属性アクセスの高速化・省メモリ）
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class SimplePState:
-    """Simple P制御器の内部状態"""
-    last_error: Tuple[float, float] = (0.0, 0.0)      # 前回の誤差（パン、チルト）
-    last_output: Tuple[float, float] = (0.0, 0.0)     # 前回の出力（パン、チルト）
-    last_update_time: float = 0.0                     # 前回の更新時刻
+    """Simple P制御器の内部状態（毎回のタプル生成を避けるため軸ごとに保持）"""
+    last_error_x: float = 0.0                         # 前回の誤差（パン）
+    last_error_y: float = 0.0                         # 前回の誤差（チルト）
+    last_output_pan: float = 0.0                      # 前回の出力（パン）
+    last_output_tilt: float = 0.0                     # 前回の出力（チルト）
+    last_update_time: float = 0.0                     # 前回の補正計算時刻（monotonic秒、不感帯内では更新しない）
     total_corrections: int = 0                        # 総補正回数
+    deadband_corrections: int = 0                     # 両軸とも不感帯内だった補正回数
+    
+    @property
+    def last_error(self) -> Tuple[float, float]:
+        """前回の誤差（パン、チルト）"""
+        return (self.last_error_x, self.last_error_y)
+    
+    @property
+    def last_output(self) -> Tuple[float, float]:
+        """前回の出力（パン、チルト）"""
+        return (self.last_output_pan, self.last_output_tilt)
+
+
+def _clip(value: float, limit: float) -> float:
+    """値を[-limit, limit]の範囲に制限（スカラー用、NumPy呼び出しのオーバーヘッドを回避）"""
+    return -limit if value < -limit else (limit if value > limit else value)
+
+
+def _p_kernel(x: float, y: float, center_x: float, center_y: float,
+              pan_gain: float, inverted_tilt_gain: float,
+              deadband: float, max_correction: float) -> Tuple[float, float, float, float]:
+    """
+    Simple P制御の数値計算（1回分）
+    
+    Numbaが利用可能な場合はネイティブコードにコンパイルされます。
+    
+    Args:
+        x, y: 検出対象の中心座標
+        center_x, center_y: 画像中心座標
+        pan_gain: パン制御ゲイン
+        inverted_tilt_gain: 符号を反転したチルト制御ゲイン（Y軸反転分を含む）
+        deadband: 不感帯（pixel）
+        max_correction: 1回の最大補正角度（度）
+        
+    Returns:
+        Tuple: (x誤差, y誤差, パン補正値, チルト補正値)
+    """
+    # 誤差計算（画像座標系）
+    x_error = x - center_x
+    y_error = y - center_y
+    
+    # 不感帯処理（小さな誤差は無視）
+    if abs(x_error) < deadband:
+        x_error = 0.0
+    if abs(y_error) < deadband:
+        y_error = 0.0
+    
+    # Simple P制御（比例制御のみ）と補正角度制限（安全性確保）
+    pan_correction = _clip(x_error * pan_gain, max_correction)
+    tilt_correction = _clip(y_error * inverted_tilt_gain, max_correction)  # Y軸反転（カメラ座標系→サーボ座標系）
+    
+    return x_error, y_error, pan_correction, tilt_correction
+
+
+if NUMBA_AVAILABLE:
+    # 型を指定してインポート時にコンパイル（初回補正時の遅延を回避し、整数座標もfloatに変換）
+    # キャッシュはモジュール名が異なる実行（単体実行など）と共有すると壊れるため使用しない
+    _clip = njit("f8(f8, f8)", fastmath=True)(_clip)
+    _p_kernel = njit("UniTuple(f8, 4)(f8, f8, f8, f8, f8, f8, f8, f8)", fastmath=True)(_p_kernel)
+
+
+def _variance(values: list) -> float:
+    """
+    母分散の計算（2パス法、少数のfloat用）
+    
+    Args:
+        values: 値のリスト（1件以上）
+        
+    Returns:
+        float: 母分散
+    """
+    mean = sum(values) / len(values)
+    return sum((v - mean) * (v - mean) for v in values) / len(values)
 
 
 class SimpleProportionalController:
@@ -64,6 +156,23 @@ class SimpleProportionalController:
     Raspberry Pi Python環境での制御周期不安定性を回避します。
     """
     
+    # 性能履歴の保持件数（リングバッファのサイズ）
+    HISTORY_SIZE = 50
+    
+    # 性能統計の対象とする直近の件数
+    STATISTICS_WINDOW = 20
+    
+    # 制御ループで毎回参照するため__slots__で属性を固定（インスタンス辞書を持たない）
+    __slots__ = (
+        'image_width', 'image_height', 'image_center', '_center_x', '_center_y', '_center_array',
+        'pan_gain', '_tilt_gain', '_inverted_tilt_gain', 'max_correction', 'deadband',
+        'name', 'state', 'status',
+        '_hist_timestamp', '_hist_error_x', '_hist_error_y',
+        '_hist_correction_pan', '_hist_correction_tilt',
+        '_hist_head', '_hist_count',
+        'start_time', 'output_buffer'
+    )
+    
     def __init__(self, 
                  image_width: int = 640,
                  image_height: int = 480,
@@ -71,7 +180,8 @@ class SimpleProportionalController:
                  tilt_gain: float = 0.0208,     # 10.0/480 (一般的な推奨値)
                  max_correction: float = 15.0,  # 1回の最大補正角度（度）
                  deadband: float = 5.0,         # 不感帯（pixel）
-                 name: str = "SimpleP"):
+                 name: str = "SimpleP",
+                 output_buffer: Optional[SynchronizedArray] = None):
         """
         Simple P制御器初期化
         
@@ -83,106 +193,176 @@ class SimpleProportionalController:
             max_correction: 1回の最大補正角度（度）
             deadband: 不感帯（pixel、この範囲内は補正しない）
             name: コントローラー名（識別用）
+            output_buffer: 補正値の書き込み先となる共有メモリ（multiprocessing.Array('d', 2)）。
+                サーボ制御を別プロセスで行う場合に、補正値をパイプ経由で送らずに受け渡すために使用
         """
         # 画像パラメータ
         self.image_width = image_width
         self.image_height = image_height
         self.image_center = (image_width // 2, image_height // 2)
+        # 毎回のタプル展開と整数→浮動小数点変換を避けるため、スカラー計算用と一括計算用に保持
+        self._center_x = float(self.image_center[0])
+        self._center_y = float(self.image_center[1])
+        self._center_array = np.array(self.image_center, dtype=np.float64)
         
         # 制御パラメータ（一般的な実証値）
         self.pan_gain = pan_gain      # Kp_pan
-        self.tilt_gain = tilt_gain    # Kp_tilt
+        self.tilt_gain = tilt_gain    # Kp_tilt（設定時にY軸反転済みのゲインも更新）
         self.max_correction = max_correction
         self.deadband = deadband
         
         # 識別情報
         self.name = name
         
+        # 別プロセスへの出力（省略時は戻り値のみ）
+        self.output_buffer = output_buffer
+        
         # 内部状態
         self.state = SimplePState()
         self.status = SimplePStatus.UNINITIALIZED
         
+        # 性能履歴（項目ごとの固定長リストによるリングバッファ、毎回の辞書生成とpop(0)を回避）
+        self._hist_timestamp = [0.0] * self.HISTORY_SIZE
+        self._hist_error_x = [0.0] * self.HISTORY_SIZE
+        self._hist_error_y = [0.0] * self.HISTORY_SIZE
+        self._hist_correction_pan = [0.0] * self.HISTORY_SIZE
+        self._hist_correction_tilt = [0.0] * self.HISTORY_SIZE
+        self._hist_head = 0   # 次に書き込む位置
+        self._hist_count = 0  # 記録済みの件数
+        
         # 性能監視
-        self.performance_history = []
         self.start_time = time.time()
         
-        # ログ設定
-        self.logger = logging.getLogger(__name__)
-        
         # 初期化完了
         self.status = SimplePStatus.READY
-        self.state.last_update_time = time.time()
+        self.state.last_update_time = time.monotonic()
         
-        self.logger.info(f"Simple P制御器'{self.name}'を初期化: "
-                        f"pan_gain={pan_gain:.4f}, tilt_gain={tilt_gain:.4f}, "
-                        f"max_correction={max_correction}度")
+        logger.info(f"Simple P制御器'{self.name}'を初期化: "
+                    f"pan_gain={pan_gain:.4f}, tilt_gain={tilt_gain:.4f}, "
+                    f"max_correction={max_correction}度")
     
     def calculate_correction(self, detection_center: Tuple[float, float]) -> Tuple[float, float]:
         """
         検出中心から角度補正値を計算（一般的な比例制御方式）
         
+        入力チェック以外は例外処理を挟まずに計算します。
+        例外を送出させたくない場合はsafe_calculate_correctionを使用してください。
+        
         Args:
             detection_center: 検出対象の中心座標 (x, y)
             
         Returns:
             Tuple[float, float]: (pan_correction, tilt_correction) 角度補正値（度）
+            
+        Raises:
+            SimplePError: 検出中心座標が(x, y)の2要素でない場合
         """
         if self.status == SimplePStatus.ERROR:
-            self.logger.warning(f"Simple P制御器'{self.name}'がエラー状態です")
+            logger.warning(f"Simple P制御器'{self.name}'がエラー状態です")
+            if self.output_buffer is not None:
+                self.output_buffer[:] = (0.0, 0.0)
             return (0.0, 0.0)
         
-        try:
-            self.status = SimplePStatus.RUNNING
-            current_time = time.time()
-            
-            # 誤差計算（画像座標系）
-            x_error = detection_center[0] - self.image_center[0]
-            y_error = detection_center[1] - self.image_center[1]
-            
-            # 不感帯処理（小さな誤差は無視）
-            if abs(x_error) < self.deadband:
-                x_error = 0.0
-            if abs(y_error) < self.deadband:
-                y_error = 0.0
-            
-            # Simple P制御（比例制御のみ、一般的な比例制御方式）
-            pan_correction = x_error * self.pan_gain
-            tilt_correction = -y_error * self.tilt_gain  # Y軸反転（カメラ座標系→サーボ座標系）
-            
-            # 補正角度制限（安全性確保）
-            pan_correction = np.clip(pan_correction, -self.max_correction, self.max_correction)
-            tilt_correction = np.clip(tilt_correction, -self.max_correction, self.max_correction)
-            
-            # 状態更新
-            self.state.last_error = (x_error, y_error)
-            self.state.last_output = (pan_correction, tilt_correction)
-            self.state.last_update_time = current_time
-            self.state.total_corrections += 1
-            
-            # 性能履歴の記録（最新50回分）
-            self.performance_history.append({
-                'timestamp': current_time,
-                'detection_center': detection_center,
-                'error': (x_error, y_error),
-                'correction': (pan_correction, tilt_correction),
-                'is_in_deadband': (abs(x_error) < self.deadband and abs(y_error) < self.deadband)
-            })
-            
-            if len(self.performance_history) > 50:
-                self.performance_history.pop(0)
-            
-            self.logger.debug(f"Simple P'{self.name}': "
-                            f"Error=({x_error:.1f}, {y_error:.1f})pixel, "
-                            f"Correction=({pan_correction:.2f}, {tilt_correction:.2f})度")
+        if len(detection_center) != 2:
+            raise SimplePError(f"検出中心座標は(x, y)の2要素で指定してください: {detection_center}")
+        
+        # 両軸とも不感帯内なら補正なし（静止時に最も多いケースのため、履歴記録やログを省略して即座に返す）
+        deadband = self.deadband
+        if (abs(detection_center[0] - self._center_x) < deadband and
+                abs(detection_center[1] - self._center_y) < deadband):
+            state = self.state
+            state.last_error_x = state.last_error_y = 0.0
+            state.last_output_pan = state.last_output_tilt = 0.0
+            state.total_corrections += 1
+            state.deadband_corrections += 1
+            if self.output_buffer is not None:
+                self.output_buffer[:] = (0.0, 0.0)
+            return (0.0, 0.0)
+        
+        self.status = SimplePStatus.RUNNING
+        current_time = time.monotonic()
+        
+        # 誤差計算・不感帯処理・比例制御・補正角度制限（一般的な比例制御方式）
+        x_error, y_error, pan_correction, tilt_correction = _p_kernel(
+            detection_center[0], detection_center[1], self._center_x, self._center_y,
+            self.pan_gain, self._inverted_tilt_gain, deadband, self.max_correction)
+        
+        # 状態更新
+        state = self.state
+        state.last_error_x = x_error
+        state.last_error_y = y_error
+        state.last_output_pan = pan_correction
+        state.last_output_tilt = tilt_correction
+        state.last_update_time = current_time
+        state.total_corrections += 1
+        
+        # 性能履歴の記録（不感帯外の最新50回分、古い値は上書き）
+        head = self._hist_head
+        self._hist_timestamp[head] = current_time
+        self._hist_error_x[head] = x_error
+        self._hist_error_y[head] = y_error
+        self._hist_correction_pan[head] = pan_correction
+        self._hist_correction_tilt[head] = tilt_correction
+        self._hist_head = (head + 1) % self.HISTORY_SIZE
+        if self._hist_count < self.HISTORY_SIZE:
+            self._hist_count += 1
+        
+        # デバッグ出力（無効時は文字列を組み立てない）
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Simple P'%s': Error=(%.1f, %.1f)pixel, Correction=(%.2f, %.2f)度",
+                         self.name, x_error, y_error, pan_correction, tilt_correction)
+        
+        # 共有メモリへの出力（スライス代入でロック1回分、パン・チルトを同時に更新）
+        if self.output_buffer is not None:
+            self.output_buffer[:] = (pan_correction, tilt_correction)
+        
+        self.status = SimplePStatus.READY
+        return (pan_correction, tilt_correction)
+    
+    def safe_calculate_correction(self, detection_center: Tuple[float, float]) -> Tuple[float, float]:
+        """
+        検出中心から角度補正値を計算（例外を送出しない制御ループ用）
+        
+        計算中にエラーが発生した場合はエラー状態に移行し、補正なしを返します。
+        
+        Args:
+            detection_center: 検出対象の中心座標 (x, y)
             
-            self.status = SimplePStatus.READY
-            return (pan_correction, tilt_correction)
+        Returns:
+            Tuple[float, float]: (pan_correction, tilt_correction) 角度補正値（度）
+        """
+        try:
+            return self.calculate_correction(detection_center)
             
         except Exception as e:
             self.status = SimplePStatus.ERROR
-            self.logger.error(f"Simple P制御計算中にエラー: {e}")
+            logger.error(f"Simple P制御計算中にエラー: {e}")
+            if self.output_buffer is not None:
+                self.output_buffer[:] = (0.0, 0.0)
             return (0.0, 0.0)
     
+    def calculate_correction_batch(self, detection_centers: np.ndarray) -> np.ndarray:
+        """
+        複数の検出中心から角度補正値を一括計算（ログ再生・オフライン解析用）
+        
+        calculate_correctionと同じ計算をNumPyでまとめて行います。
+        内部状態・性能履歴は更新しません。
+        
+        Args:
+            detection_centers: 検出対象の中心座標の配列 (N, 2)
+            
+        Returns:
+            np.ndarray: (pan_correction, tilt_correction) 角度補正値の配列 (N, 2)
+        """
+        errors = np.asarray(detection_centers, dtype=np.float64) - self._center_array
+        
+        # 不感帯処理（小さな誤差は無視）
+        errors = np.where(np.abs(errors) < self.deadband, 0.0, errors)
+        
+        # Simple P制御（Y軸反転込みのゲイン）と補正角度制限
+        corrections = errors * (self.pan_gain, self._inverted_tilt_gain)
+        return np.clip(corrections, -self.max_correction, self.max_correction)
+    
     def calculate_tracking_error(self, detection_bbox: Tuple[float, float, float, float]) -> Tuple[float, float]:
         """
         バウンディングボックスから制御誤差を計算
@@ -205,9 +385,20 @@ class SimpleProportionalController:
             return (pan_error, tilt_error)
             
         except Exception as e:
-            self.logger.error(f"制御誤差計算エラー: {e}")
+            logger.error(f"制御誤差計算エラー: {e}")
             return (0.0, 0.0)
     
+    @property
+    def tilt_gain(self) -> float:
+        """チルト制御ゲイン"""
+        return self._tilt_gain
+    
+    @tilt_gain.setter
+    def tilt_gain(self, tilt_gain: float) -> None:
+        self._tilt_gain = tilt_gain
+        # Y軸反転（カメラ座標系→サーボ座標系）を含めたゲインを事前計算
+        self._inverted_tilt_gain = -float(tilt_gain)
+    
     def set_gains(self, pan_gain: float, tilt_gain: float) -> None:
         """
         制御ゲインの動的変更
@@ -220,9 +411,9 @@ class SimpleProportionalController:
         self.pan_gain = pan_gain
         self.tilt_gain = tilt_gain
         
-        self.logger.info(f"Simple P'{self.name}'ゲイン変更: "
-                        f"({old_gains[0]:.4f}, {old_gains[1]:.4f}) -> "
-                        f"({pan_gain:.4f}, {tilt_gain:.4f})")
+        logger.info(f"Simple P'{self.name}'ゲイン変更: "
+                    f"({old_gains[0]:.4f}, {old_gains[1]:.4f}) -> "
+                    f"({pan_gain:.4f}, {tilt_gain:.4f})")
     
     def set_max_correction(self, max_correction: float) -> None:
         """
@@ -234,7 +425,7 @@ class SimpleProportionalController:
         old_max = self.max_correction
         self.max_correction = max_correction
         
-        self.logger.info(f"Simple P'{self.name}'最大補正角度変更: {old_max}度 -> {max_correction}度")
+        logger.info(f"Simple P'{self.name}'最大補正角度変更: {old_max}度 -> {max_correction}度")
     
     def set_deadband(self, deadband: float) -> None:
         """
@@ -246,7 +437,7 @@ class SimpleProportionalController:
         old_deadband = self.deadband
         self.deadband = deadband
         
-        self.logger.info(f"Simple P'{self.name}'不感帯変更: {old_deadband}pixel -> {deadband}pixel")
+        logger.info(f"Simple P'{self.name}'不感帯変更: {old_deadband}pixel -> {deadband}pixel")
     
     def get_parameters(self) -> Dict:
         """制御パラメータの取得"""
@@ -276,20 +467,20 @@ class SimpleProportionalController:
         Returns:
             Dict: 性能統計情報
         """
-        if not self.performance_history:
+        if self._hist_count == 0:
             return {
                 'name': self.name,
                 'total_corrections': self.state.total_corrections,
                 'status': self.status.value
             }
         
-        # 最近の性能データを分析
-        recent_errors_x = [p['error'][0] for p in self.performance_history[-20:]]
-        recent_errors_y = [p['error'][1] for p in self.performance_history[-20:]]
-        recent_corrections_pan = [p['correction'][0] for p in self.performance_history[-20:]]
-        recent_corrections_tilt = [p['correction'][1] for p in self.performance_history[-20:]]
-        
-        deadband_count = sum(1 for p in self.performance_history[-20:] if p['is_in_deadband'])
+        # 最近の性能データを分析（最大20件と少数のため、NumPyの呼び出しコストを避けてPythonで集計）
+        window = self.STATISTICS_WINDOW
+        recent_errors_x = self._recent(self._hist_error_x, window)
+        recent_errors_y = self._recent(self._hist_error_y, window)
+        recent_corrections_pan = self._recent(self._hist_correction_pan, window)
+        recent_corrections_tilt = self._recent(self._hist_correction_tilt, window)
+        count = len(recent_errors_x)
         
         stats = {
             'name': self.name,
@@ -297,14 +488,14 @@ class SimpleProportionalController:
             'total_corrections': self.state.total_corrections,
             'status': self.status.value,
             'recent_performance': {
-                'mean_error_x': np.mean(np.abs(recent_errors_x)) if recent_errors_x else 0,
-                'mean_error_y': np.mean(np.abs(recent_errors_y)) if recent_errors_y else 0,
-                'mean_correction_pan': np.mean(np.abs(recent_corrections_pan)) if recent_corrections_pan else 0,
-                'mean_correction_tilt': np.mean(np.abs(recent_corrections_tilt)) if recent_corrections_tilt else 0,
-                'deadband_rate': deadband_count / min(len(self.performance_history), 20),
+                'mean_error_x': sum(map(abs, recent_errors_x)) / count,
+                'mean_error_y': sum(map(abs, recent_errors_y)) / count,
+                'mean_correction_pan': sum(map(abs, recent_corrections_pan)) / count,
+                'mean_correction_tilt': sum(map(abs, recent_corrections_tilt)) / count,
+                'deadband_rate': self.state.deadband_corrections / self.state.total_corrections,
                 'tracking_precision': {
-                    'x_variance': np.var(recent_errors_x) if recent_errors_x else 0,
-                    'y_variance': np.var(recent_errors_y) if recent_errors_y else 0
+                    'x_variance': _variance(recent_errors_x),
+                    'y_variance': _variance(recent_errors_y)
                 }
             }
         }
@@ -313,21 +504,126 @@ class SimpleProportionalController:
     
     def reset(self) -> None:
         """制御器状態のリセット"""
-        self.logger.info(f"Simple P制御器'{self.name}'をリセット")
+        logger.info(f"Simple P制御器'{self.name}'をリセット")
         
         # 内部状態のクリア
-        self.state.last_error = (0.0, 0.0)
-        self.state.last_output = (0.0, 0.0)
-        self.state.last_update_time = time.time()
+        self.state.last_error_x = 0.0
+        self.state.last_error_y = 0.0
+        self.state.last_output_pan = 0.0
+        self.state.last_output_tilt = 0.0
+        self.state.last_update_time = time.monotonic()
         self.state.total_corrections = 0
+        self.state.deadband_corrections = 0
         
         # 性能履歴のクリア
-        self.performance_history.clear()
+        self._clear_history()
         
         # ステータスを準備完了に変更
         if self.status != SimplePStatus.ERROR:
             self.status = SimplePStatus.READY
     
+    def _clear_history(self) -> None:
+        """性能履歴のクリア（リストは再利用）"""
+        self._hist_head = 0
+        self._hist_count = 0
+    
+    def _recent(self, values: list, count: int) -> list:
+        """
+        リングバッファから直近の履歴を古い順に取得
+        
+        Args:
+            values: 履歴リスト（_hist_*のいずれか）
+            count: 取得する件数（記録済み件数が上限）
+            
+        Returns:
+            list: 直近count件の値
+        """
+        count = min(count, self._hist_count)
+        start = self._hist_head - count
+        if start >= 0:
+            return values[start:self._hist_head]
+        # リストの末尾から先頭へ折り返している場合は2区間を連結
+        return values[start:] + values[:self._hist_head]
+    
+    @property
+    def performance_history(self) -> List[Dict]:
+        """
+        性能履歴の取得（古い順、互換性のため辞書のリストで返す）
+        
+        両軸とも不感帯内だった補正は記録されません。
+        
+        Returns:
+            List[Dict]: 各補正時の誤差・補正値
+        """
+        count = self.HISTORY_SIZE
+        return [
+            {
+                'timestamp': timestamp,
+                'error': (error_x, error_y),
+                'correction': (correction_pan, correction_tilt)
+            }
+            for timestamp, error_x, error_y, correction_pan, correction_tilt in zip(
+                self._recent(self._hist_timestamp, count),
+                self._recent(self._hist_error_x, count),
+                self._recent(self._hist_error_y, count),
+                self._recent(self._hist_correction_pan, count),
+                self._recent(self._hist_correction_tilt, count)
+            )
+        ]
+    
+    def pin_to_core(self, core: int, rt_priority: int = 20) -> bool:
+        """
+        呼び出し元スレッドを1つのCPUコアに固定し、リアルタイム優先度（SCHED_FIFO）を設定（Linuxのみ）
+        
+        制御ループを実行するスレッドから呼び出してください。
+        コア間の移動や他プロセスによる割り込みで生じる制御周期のばらつきを抑えます。
+        SCHED_FIFOの設定にはroot権限（sudo）またはCAP_SYS_NICEが必要です。
+        
+        Args:
+            core: 割り当てるCPUコア番号
+            rt_priority: SCHED_FIFOの優先度（1〜99）
+            
+        Returns:
+            bool: コア固定とリアルタイム優先度の両方を設定できた場合True
+        """
+        if not sys.platform.startswith("linux"):
+            logger.warning("CPUコア固定・リアルタイム優先度はLinuxでのみ利用できます")
+            return False
+        
+        try:
+            # pid=0は呼び出し元スレッドのみに適用される
+            os.sched_setaffinity(0, {core})
+        except OSError as e:
+            logger.warning(f"CPUコア{core}への固定に失敗しました: {e}")
+            return False
+        
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(rt_priority))
+        except OSError as e:
+            logger.warning(f"リアルタイム優先度の設定に失敗しました（root権限またはCAP_SYS_NICEが必要）: {e}")
+            return False
+        
+        logger.info(f"Simple P'{self.name}'制御スレッドをCPUコア{core}に固定（SCHED_FIFO優先度={rt_priority}）")
+        return True
+    
+    def warmup(self, iterations: int = 10) -> None:
+        """
+        制御ループ開始前の慣らし実行
+        
+        不感帯外の位置で補正計算を数回実行し、計算経路のページフォルトや
+        キャッシュミスを事前に解消します。実行後は状態と性能履歴をリセットします。
+        
+        Args:
+            iterations: 実行回数
+        """
+        # 不感帯の外側（画像中心から不感帯の2倍ずらした位置）で計算経路全体を通す
+        offset = self.deadband * 2 + 1.0
+        warmup_center = (self._center_x + offset, self._center_y + offset)
+        for _ in range(iterations):
+            self.calculate_correction(warmup_center)
+        
+        self.reset()
+    
     def get_status(self) -> SimplePStatus:
         """ステータス取得"""
         return self.status
@@ -335,29 +631,29 @@ class SimpleProportionalController:
     def cleanup(self) -> None:
         """リソース解放"""
         try:
-            self.logger.info(f"Simple P制御器'{self.name}'をクリーンアップ中...")
+            logger.info(f"Simple P制御器'{self.name}'をクリーンアップ中...")
             
             # 統計情報の最終出力
             if self.state.total_corrections > 0:
                 try:
                     stats = self.get_performance_statistics()
                     recent_perf = stats.get('recent_performance', {})
-                    self.logger.info(f"Simple P'{self.name}'最終統計: "
-                                   f"補正回数={stats.get('total_corrections', 0)}, "
-                                   f"平均誤差=({recent_perf.get('mean_error_x', 0):.1f}, "
-                                   f"{recent_perf.get('mean_error_y', 0):.1f})pixel, "
-                                   f"不感帯率={recent_perf.get('deadband_rate', 0):.1%}")
+                    logger.info(f"Simple P'{self.name}'最終統計: "
+                                f"補正回数={stats.get('total_corrections', 0)}, "
+                                f"平均誤差=({recent_perf.get('mean_error_x', 0):.1f}, "
+                                f"{recent_perf.get('mean_error_y', 0):.1f})pixel, "
+                                f"不感帯率={recent_perf.get('deadband_rate', 0):.1%}")
                 except Exception as e:
-                    self.logger.warning(f"Simple P'{self.name}'統計情報取得エラー: {e}")
+                    logger.warning(f"Simple P'{self.name}'統計情報取得エラー: {e}")
             
             # 状態のクリア
-            self.performance_history.clear()
+            self._clear_history()
             self.status = SimplePStatus.UNINITIALIZED
             
-            self.logger.info(f"Simple P制御器'{self.name}'のクリーンアップが完了しました")
+            logger.info(f"Simple P制御器'{self.name}'のクリーンアップが完了しました")
             
         except Exception as e:
-            self.logger.error(f"Simple P制御器'{self.name}'クリーンアップ中にエラー: {e}")
+            logger.error(f"Simple P制御器'{self.name}'クリーンアップ中にエラー: {e}")
 
 
 class DualSimplePController:
@@ -391,20 +687,13 @@ class DualSimplePController:
             name="DualSimpleP"
         )
         
-        self.logger = logging.getLogger(__name__)
-        self.logger.info("デュアルSimple P制御器を初期化しました")
-    
-    def update(self, detection_center: Tuple[float, float]) -> Tuple[float, float]:
-        """
-        両軸のSimple P制御更新
+        # 委譲のみのメソッドは内部制御器のバウンドメソッドを直接公開（1回分の関数呼び出しを削減）
+        # update(detection_center) -> (pan_correction, tilt_correction): 両軸のSimple P制御更新
+        self.update = self.controller.calculate_correction
+        # get_statistics() -> Dict: 統計情報の取得
+        self.get_statistics = self.controller.get_performance_statistics
         
-        Args:
-            detection_center: 検出中心座標 (x, y)
-            
-        Returns:
-            Tuple[float, float]: (pan_correction, tilt_correction) 制御出力
-        """
-        return self.controller.calculate_correction(detection_center)
+        logger.info("デュアルSimple P制御器を初期化しました")
     
     def update_from_bbox(self, detection_bbox: Tuple[float, float, float, float]) -> Tuple[float, float]:
         """
@@ -420,21 +709,17 @@ class DualSimplePController:
         center_x = (detection_bbox[0] + detection_bbox[2]) / 2
         center_y = (detection_bbox[1] + detection_bbox[3]) / 2
         
-        return self.controller.calculate_correction((center_x, center_y))
+        return self.update((center_x, center_y))
     
     def reset(self) -> None:
         """制御器のリセット"""
         self.controller.reset()
-        self.logger.info("デュアルSimple P制御器をリセットしました")
-    
-    def get_statistics(self) -> Dict:
-        """統計情報の取得"""
-        return self.controller.get_performance_statistics()
+        logger.info("デュアルSimple P制御器をリセットしました")
     
     def cleanup(self) -> None:
         """リソース解放"""
         self.controller.cleanup()
-        self.logger.info("デュアルSimple P制御器のクリーンアップが完了しました")
+        logger.info("デュアルSimple P制御器のクリーンアップが完了しました")
 
 
 # ファクトリ関数
@@ -501,9 +786,12 @@ if __name__ == "__main__":
     print("テスト形式: 検出位置 -> 誤差(pixel) -> 補正(度)")
     print("-" * 60)
     
-    for i, (x, y) in enumerate(test_cases):
-        correction = simple_p.calculate_correction((x, y))
-        error = simple_p.get_state()['last_error']
+    # 全テストケースを一括計算
+    centers = np.array(test_cases, dtype=np.float64)
+    errors = centers - simple_p.image_center
+    corrections = simple_p.calculate_correction_batch(centers)
+    
+    for i, ((x, y), error, correction) in enumerate(zip(test_cases, errors, corrections)):
         print(f"Test {i+1}: ({x:3d}, {y:3d}) -> Error=({error[0]:6.1f}, {error[1]:6.1f}) -> "
               f"Correction=({correction[0]:6.2f}, {correction[1]:6.2f})")
     
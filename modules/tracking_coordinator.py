@@ -23,14 +23,15 @@
 """
 
 import cv2
+import math
 import time
 import logging
 import numpy as np
 from typing import Optional, Dict, Tuple, List
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
 import threading
-from datetime import datetime
+import queue
 
 # プロジェクトモジュールのインポート
 from .servo_controller import ServoController
@@ -38,6 +39,19 @@ from .yolo_detector import YOLODetector
 from .simple_p_controller import SimpleProportionalController
 
 
+# 検出結果選択時の画面中心からの距離の重み（信頼度から 重み×距離[px] を減点）
+CENTER_DISTANCE_WEIGHT = 0.001
+
+# 周期待機の最後にスピン待機する時間（秒、sleepの揺らぎを避けるため）
+SPIN_WAIT_TIME = 0.001
+
+# フレームバッファ数（取得中・検出中・表示中のフレームがそれぞれ別のバッファを使う）
+FRAME_BUFFER_COUNT = 3
+
+# 処理ループ内のエラーをまとめてログ出力する間隔（秒）
+ERROR_REPORT_INTERVAL = 1.0
+
+
 class TrackingMode(Enum):
     """追跡システムの動作モード"""
     STANDBY = "standby"      # 待機モード
@@ -55,9 +69,9 @@ class SystemStatus:
     pan_angle: float = 0.0
     tilt_angle: float = 0.0
     correction_applied: Tuple[float, float] = (0.0, 0.0)
-    last_detection_time: Optional[datetime] = None
+    last_detection_time: Optional[float] = None  # time.monotonic()の値
     total_detections: int = 0
-    tracking_duration: float = 0.0
+    tracking_duration: float = 0.0  # get_system_status()で参照時に計算
 
 
 class TrackingCoordinator:
@@ -74,7 +88,11 @@ class TrackingCoordinator:
                  image_height: int = 480,
                  detection_interval: float = 0.5,
                  lost_target_timeout: float = 5.0,
-                 show_display: bool = True):
+                 control_interval: float = 0.05,
+                 show_display: bool = True,
+                 model_backend: str = "auto",
+                 precision: str = "int8",
+                 detect_width: int = 320):
         """
         追跡統合制御システム初期化
         
@@ -84,7 +102,11 @@ class TrackingCoordinator:
             image_height (int): 処理する画像の高さ（ピクセル、推奨: 480）
             detection_interval (float): 検出処理の間隔（秒、小さいほど高速）
             lost_target_timeout (float): 対象ロスト判定時間（秒、スキャンモード移行まで）
+            control_interval (float): 制御・表示ループの周期（秒、検出間隔より短く設定）
             show_display (bool): 画面表示の有無（Headlessモード対応）
+            model_backend (str): YOLO推論バックエンド（"auto"はARMでTFLite、x86でOpenVINO）
+            precision (str): YOLO推論精度（"int8", "fp16", "fp32"）
+            detect_width (int): 検出処理用に縮小する画像の幅（ピクセル、高さは縦横比から計算）
         """
         # 基本設定
         self.camera_id = camera_id
@@ -92,16 +114,44 @@ class TrackingCoordinator:
         self.image_height = image_height
         self.detection_interval = detection_interval
         self.lost_target_timeout = lost_target_timeout
+        self.control_interval = control_interval
         self.show_display = show_display
+        # キー入力確認（待機せずに戻るpollKeyを優先、OpenCV 4.5未満はwaitKey(1)）
+        self._poll_key = getattr(cv2, 'pollKey', None) or (lambda: cv2.waitKey(1))
+        self.model_backend = model_backend
+        self.precision = precision
+        
+        # 検出用の縮小フレーム（表示はフル解像度のまま、バッファは使い回す）
+        self.detect_width = min(detect_width, image_width)
+        self.detect_height = round(image_height * self.detect_width / image_width)
+        if self.detect_width < image_width:
+            self._detect_buffer = np.empty((self.detect_height, self.detect_width, 3), dtype=np.uint8)
+        else:
+            self._detect_buffer = None
         
-        # システム状態
+        # システム状態（制御スレッドのみが更新する作業用の状態）
         self.status = SystemStatus()
+        # 外部から参照する状態のスナップショット（参照の差し替えのみで更新するためロック不要）
+        self._status_snapshot = replace(self.status)
         self.is_running = False
-        self.system_start_time = None
+        self.system_start_time = None  # time.monotonic()の値
+        self.system_stop_time = None   # time.monotonic()の値
         
         # カメラ設定
         self.camera = None
         
+        # フレームバッファ（事前確保して順番に使い回し、毎フレームのメモリ確保を避ける）
+        self._frame_buffers = [np.empty((image_height, image_width, 3), dtype=np.uint8)
+                               for _ in range(FRAME_BUFFER_COUNT)]
+        self._frame_buffer_index = 0
+        
+        # 表示用の静的オーバーレイ（フレーム形状, 描画画素の位置, 色）
+        self._static_overlay = None
+        
+        # システム情報の描画キャッシュ（表示内容が変わった時だけ再描画）
+        self._info_overlay = None
+        self._info_overlay_key = None
+        
         # モジュール初期化（後で実際に初期化）
         self.servo_controller = None
         self.yolo_detector = None
@@ -109,7 +159,20 @@ class TrackingCoordinator:
         
         # スレッド制御
         self.main_thread = None
-        self.lock = threading.Lock()
+        self.capture_thread = None
+        self.detection_thread = None
+        self.error_reporter_thread = None
+        self.stop_event = threading.Event()  # 停止要求の通知用
+        
+        # パイプライン（キャプチャ → 検出 → 制御）用キュー、常に最新の1件だけを保持
+        self.frame_queue = queue.Queue(maxsize=1)
+        self.detection_queue = queue.Queue(maxsize=1)
+        self.frame_request = threading.Event()  # 検出スレッドからのフレーム要求
+        
+        # 処理ループ内のエラー集計（メッセージ → (回数, 最後の例外)）
+        # ループ内ではログを出力せずに数えるだけにし、まとめて別スレッドで出力する
+        self._error_counts: Dict[str, Tuple[int, Exception]] = {}
+        self._error_lock = threading.Lock()  # 各スレッドからの記録と出力時の差し替えを排他（エラー発生時のみ使用）
         
         # ログ設定
         self.logger = logging.getLogger(__name__)
@@ -136,6 +199,8 @@ class TrackingCoordinator:
             self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.image_width)
             self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.image_height)
             self.camera.set(cv2.CAP_PROP_FPS, 30)
+            # ドライバ側に古いフレームを溜めない（読み飛ばしで常に最新フレームを扱うため）
+            self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             
             self.logger.info(f"✓ カメラ初期化完了 ({self.image_width}x{self.image_height})")
             
@@ -154,7 +219,11 @@ class TrackingCoordinator:
             
             # 3. YOLO検出器の初期化
             self.logger.info("3. YOLO検出器を初期化中...")
-            self.yolo_detector = YOLODetector()
+            self.yolo_detector = YOLODetector(
+                image_size=(self.detect_width, self.detect_height),
+                backend=self.model_backend,
+                precision=self.precision
+            )
             if not self.yolo_detector.load_model():
                 self.logger.error("YOLO検出器の初期化に失敗しました")
                 return False
@@ -169,8 +238,10 @@ class TrackingCoordinator:
             self.logger.info("✓ Simple P制御器初期化完了")
             
             # システム開始時刻記録
-            self.system_start_time = datetime.now()
+            self.system_start_time = time.monotonic()
+            self.system_stop_time = None
             self.status.mode = TrackingMode.SCANNING
+            self._publish_status()
             
             self.logger.info("=== システム初期化完了 ===")
             return True
@@ -190,11 +261,19 @@ class TrackingCoordinator:
             return
         
         self.is_running = True
+        self.stop_event.clear()
         self.logger.info("🐕 ペット追跡システムを開始します 🐱")
         
-        # メインループをスレッドで実行
+        # キャプチャ・検出・制御をそれぞれ別スレッドで実行
+        # YOLO推論中もサーボ制御と表示が止まらないようにする
+        self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.detection_thread = threading.Thread(target=self._detection_loop, daemon=True)
         self.main_thread = threading.Thread(target=self._main_loop, daemon=True)
+        self.error_reporter_thread = threading.Thread(target=self._error_reporter_loop, daemon=True)
+        self.capture_thread.start()
+        self.detection_thread.start()
         self.main_thread.start()
+        self.error_reporter_thread.start()
         
         if self.show_display:
             self.logger.info("画面表示: 'q'キーで終了します")
@@ -202,57 +281,183 @@ class TrackingCoordinator:
     def stop_tracking(self) -> None:
         """追跡システム停止"""
         self.logger.info("追跡システムを停止しています...")
+        if self.system_start_time is not None and self.system_stop_time is None:
+            self.system_stop_time = time.monotonic()
         self.is_running = False
+        self.stop_event.set()
         
-        # スレッド終了待機
-        if self.main_thread and self.main_thread.is_alive():
-            self.main_thread.join(timeout=2.0)
+        # スレッド終了待機（自スレッドからの呼び出しはjoinしない）
+        current_thread = threading.current_thread()
+        for thread in (self.main_thread, self.detection_thread, self.capture_thread,
+                       self.error_reporter_thread):
+            if thread and thread.is_alive() and thread is not current_thread:
+                thread.join(timeout=2.0)
+        
+        # 未出力のエラー集計を出力
+        self._flush_error_log()
         
         # リソース解放
         self._cleanup_resources()
         self.logger.info("追跡システムが停止しました")
     
-    def _main_loop(self) -> None:
-        """メインループ（スレッドで実行）"""
-        last_detection_time = time.time()
-        
+    @staticmethod
+    def _put_latest(target_queue: queue.Queue, item) -> None:
+        """キューの古い要素を捨てて最新の要素だけを入れる"""
+        try:
+            target_queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            target_queue.put_nowait(item)
+        except queue.Full:
+            pass
+    
+    def _capture_loop(self) -> None:
+        """フレーム取得ループ（キャプチャスレッドで実行）"""
         try:
             while self.is_running:
-                loop_start_time = time.time()
+                # 常にgrab()でフレームを読み進め、ドライバ側に古いフレームを溜めない
+                if not self.camera.grab():
+                    self.logger.warning("カメラからフレームを取得できませんでした")
+                    time.sleep(0.1)
+                    continue
+                
+                # 検出スレッドが要求した時だけデコード
+                if not self.frame_request.is_set():
+                    continue
                 
-                # フレーム取得
-                ret, frame = self.camera.read()
+                # 検出・表示で使用中のものとは別のバッファへデコード
+                buffer = self._frame_buffers[self._frame_buffer_index]
+                ret, frame = self.camera.retrieve(buffer)
                 if not ret:
                     self.logger.warning("カメラからフレームを取得できませんでした")
-                    time.sleep(0.1)
+                    continue
+                
+                # カメラの解像度が設定と異なる場合はOpenCVが確保した配列を以降のバッファにする
+                if frame is not buffer:
+                    self._frame_buffers[self._frame_buffer_index] = frame
+                self._frame_buffer_index = (self._frame_buffer_index + 1) % FRAME_BUFFER_COUNT
+                
+                self.frame_request.clear()
+                self._put_latest(self.frame_queue, frame)
+                
+        except Exception as e:
+            self.logger.error(f"キャプチャループでエラー: {e}")
+            self.is_running = False
+            self.stop_event.set()
+    
+    def _detection_loop(self) -> None:
+        """検出ループ（検出スレッドで実行）"""
+        try:
+            next_detection_time = time.monotonic()
+            while self.is_running:
+                # 最新フレームを要求して受け取る
+                self.frame_request.set()
+                try:
+                    frame = self.frame_queue.get(timeout=1.0)
+                except queue.Empty:
                     continue
                 
                 # 検出処理実行
                 detection_results = self._process_detection(frame)
+                self._put_latest(self.detection_queue, (frame, detection_results, time.monotonic()))
                 
-                # 追跡制御実行
-                self._update_tracking_control(detection_results)
+                # 処理間隔調整（遅れた場合は周期単位で読み飛ばし、検出タイミングの位相を保つ）
+                next_detection_time += self.detection_interval
+                now = time.monotonic()
+                if next_detection_time < now:
+                    missed = int((now - next_detection_time) / self.detection_interval) + 1
+                    next_detection_time += missed * self.detection_interval
                 
-                # 表示更新
-                if self.show_display:
-                    display_frame = self._create_display_frame(frame, detection_results)
-                    cv2.imshow("ペット追跡システム", display_frame)
+                if not self._wait_until(next_detection_time):
+                    break
+                
+        except Exception as e:
+            self.logger.error(f"検出ループでエラー: {e}")
+            self.is_running = False
+            self.stop_event.set()
+    
+    def _record_error(self, message: str, error: Exception) -> None:
+        """
+        処理ループ内のエラーを記録（ログ出力はエラー集計スレッドでまとめて行う）
+        
+        Args:
+            message: エラーの内容
+            error: 発生した例外
+        """
+        with self._error_lock:
+            count, _ = self._error_counts.get(message, (0, None))
+            self._error_counts[message] = (count + 1, error)
+    
+    def _flush_error_log(self) -> None:
+        """集計したエラーをまとめてログ出力"""
+        # 辞書ごと差し替えて、出力中に記録されたエラーは次回に回す（ログ出力はロック外で行う）
+        with self._error_lock:
+            error_counts, self._error_counts = self._error_counts, {}
+        for message, (count, error) in error_counts.items():
+            self.logger.error(f"{message}: {count}回（最後のエラー: {error}）")
+    
+    def _error_reporter_loop(self) -> None:
+        """エラー集計の定期出力ループ（エラー集計スレッドで実行）"""
+        while not self.stop_event.wait(ERROR_REPORT_INTERVAL):
+            self._flush_error_log()
+    
+    def _wait_until(self, deadline: float) -> bool:
+        """
+        指定時刻まで待機
+        
+        大半はスリープで待ち、最後の短い時間だけスピン待機して待機時間の揺らぎを抑えます。
+        
+        Args:
+            deadline: 待機終了時刻（time.monotonic()の値）
+            
+        Returns:
+            bool: 待機完了時True、停止要求があった場合False
+        """
+        remaining = deadline - time.monotonic()
+        if remaining > 2 * SPIN_WAIT_TIME:
+            if self.stop_event.wait(remaining - SPIN_WAIT_TIME):
+                return False
+        
+        while time.monotonic() < deadline:
+            pass
+        
+        return self.is_running
+    
+    def _main_loop(self) -> None:
+        """メインループ（制御・表示、スレッドで実行）"""
+        try:
+            while self.is_running:
+                # 制御周期の間だけ新しい検出結果を待つ
+                try:
+                    frame, detection_results, detected_at = self.detection_queue.get(
+                        timeout=self.control_interval)
+                except queue.Empty:
+                    frame = None
+                
+                if frame is not None:
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug("検出から制御までの遅延: %.1fms",
+                                          (time.monotonic() - detected_at) * 1000)
+                    
+                    # 追跡制御実行
+                    self._update_tracking_control(detection_results)
                     
-                    # キー入力チェック
-                    key = cv2.waitKey(1) & 0xFF
+                    # 表示更新
+                    if self.show_display:
+                        display_frame = self._create_display_frame(frame, detection_results)
+                        cv2.imshow("ペット追跡システム", display_frame)
+                    
+                    # システム状態更新
+                    self._update_system_status(detection_results)
+                
+                # キー入力チェック（新しい結果がなくてもウィンドウを更新）
+                if self.show_display:
+                    key = self._poll_key() & 0xFF
                     if key == ord('q'):
                         self.logger.info("ユーザーによる終了要求")
                         break
                 
-                # システム状態更新
-                self._update_system_status(detection_results)
-                
-                # 処理間隔調整
-                elapsed_time = time.time() - loop_start_time
-                sleep_time = max(0, self.detection_interval - elapsed_time)
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-                
         except Exception as e:
             self.logger.error(f"メインループでエラー: {e}")
         finally:
@@ -269,20 +474,55 @@ class TrackingCoordinator:
             List[Dict]: 検出結果リスト
         """
         try:
-            # YOLO検出実行
-            detections = self.yolo_detector.detect_pets(frame)
+            # 検出用に縮小（確保済みのバッファに書き込み、毎回のメモリ確保を避ける）
+            if self._detect_buffer is not None:
+                detect_frame = cv2.resize(frame, (self.detect_width, self.detect_height),
+                                          dst=self._detect_buffer, interpolation=cv2.INTER_AREA)
+            else:
+                detect_frame = frame
             
-            # 最も信頼度の高い検出結果を取得
-            if detections:
-                best_detection = self.yolo_detector.get_best_detection(detections)
-                return [best_detection] if best_detection else []
+            # YOLO検出実行（形状(N, 6)の配列 [x1, y1, x2, y2, confidence, class_id]）
+            boxes = self.yolo_detector.detect_pets_array(detect_frame)
+            if len(boxes) == 0:
+                return []
             
-            return []
+            # 座標を元のフレームの解像度に戻す
+            if detect_frame is not frame:
+                boxes[:, [0, 2]] *= frame.shape[1] / self.detect_width
+                boxes[:, [1, 3]] *= frame.shape[0] / self.detect_height
+            
+            # 追跡に最も適した検出結果を取得
+            best = self._select_best_detection(boxes)
+            class_id = int(best[5])
+            return [{
+                'class_id': class_id,
+                'class_name': self.yolo_detector.class_names.get(class_id, f"Class_{class_id}"),
+                'confidence': float(best[4]),
+                'bbox': (int(best[0]), int(best[1]), int(best[2]), int(best[3]))
+            }]
             
         except Exception as e:
-            self.logger.error(f"検出処理でエラー: {e}")
+            self._record_error("検出処理でエラー", e)
             return []
     
+    def _select_best_detection(self, boxes: np.ndarray) -> np.ndarray:
+        """
+        複数の検出結果から追跡対象を選択
+        
+        信頼度が高く、画面中心に近いものを優先します（全検出結果をNumPyで一括計算）。
+        
+        Args:
+            boxes: 形状(N, 6)の検出結果配列 [x1, y1, x2, y2, confidence, class_id]
+            
+        Returns:
+            np.ndarray: 選択された検出結果（形状(6,)）
+        """
+        center_x = 0.5 * (boxes[:, 0] + boxes[:, 2])
+        center_y = 0.5 * (boxes[:, 1] + boxes[:, 3])
+        distance = np.hypot(center_x - self.image_width / 2, center_y - self.image_height / 2)
+        score = boxes[:, 4] - CENTER_DISTANCE_WEIGHT * distance
+        return boxes[score.argmax()]
+    
     def _update_tracking_control(self, detections: List[Dict]) -> None:
         """
         追跡制御更新
@@ -291,73 +531,78 @@ class TrackingCoordinator:
             detections: 検出結果リスト
         """
         try:
-            with self.lock:
-                if detections:
-                    # 対象が検出された場合
-                    detection = detections[0]
-                    
-                    # 追跡モードに切り替え
-                    if self.status.mode != TrackingMode.TRACKING:
-                        self.status.mode = TrackingMode.TRACKING
-                        self.logger.info(f"🎯 追跡開始: {detection['class_name']}")
-                    
-                    # Simple P制御で補正値計算
-                    bbox = detection['bbox']
-                    center_x = (bbox[0] + bbox[2]) / 2
-                    center_y = (bbox[1] + bbox[3]) / 2
-                    
-                    correction = self.simple_p_controller.calculate_correction((center_x, center_y))
-                    
-                    # サーボ角度更新
-                    new_pan = self.status.pan_angle + correction[0]
-                    new_tilt = self.status.tilt_angle + correction[1]
-                    
-                    # 角度制限確認
-                    if self.servo_controller.is_angle_safe(new_pan, new_tilt):
-                        self.servo_controller.set_angles(new_pan, new_tilt)
-                        self.status.pan_angle = new_pan
-                        self.status.tilt_angle = new_tilt
-                        self.status.correction_applied = correction
-                    
-                    # 検出情報更新
-                    self.status.target_detected = True
-                    self.status.target_class = detection['class_name']
-                    self.status.target_confidence = detection['confidence']
-                    self.status.last_detection_time = datetime.now()
+            if detections:
+                # 対象が検出された場合
+                detection = detections[0]
+                
+                # 追跡モードに切り替え
+                if self.status.mode != TrackingMode.TRACKING:
+                    self.status.mode = TrackingMode.TRACKING
+                    self.logger.info(f"🎯 追跡開始: {detection['class_name']}")
+                
+                # Simple P制御で補正値計算
+                bbox = detection['bbox']
+                center_x = (bbox[0] + bbox[2]) / 2
+                center_y = (bbox[1] + bbox[3]) / 2
+                
+                correction = self.simple_p_controller.safe_calculate_correction((center_x, center_y))
+                
+                # サーボ角度更新
+                new_pan = self.status.pan_angle + correction[0]
+                new_tilt = self.status.tilt_angle + correction[1]
+                
+                # 角度制限確認
+                # 目標角度を渡すだけで待たず、書き込みはサーボ側のスレッドで実行
+                if self.servo_controller.is_angle_safe(new_pan, new_tilt):
+                    self.servo_controller.set_target(new_pan, new_tilt)
+                    if (correction[0] != 0 or correction[1] != 0) and self.yolo_detector:
+                        # カメラが動くため、前回の検出座標は次の検出で再利用しない
+                        self.yolo_detector.invalidate_previous_result()
+                    self.status.pan_angle = new_pan
+                    self.status.tilt_angle = new_tilt
+                    self.status.correction_applied = correction
+                
+                # 検出情報更新
+                self.status.target_detected = True
+                self.status.target_class = detection['class_name']
+                self.status.target_confidence = detection['confidence']
+                self.status.last_detection_time = time.monotonic()
+                
+            else:
+                # 対象が検出されなかった場合
+                self.status.target_detected = False
+                
+                # 一定時間検出されない場合はスキャンモードに切り替え
+                if (self.status.last_detection_time is not None and
+                    time.monotonic() - self.status.last_detection_time > self.lost_target_timeout):
                     
-                else:
-                    # 対象が検出されなかった場合
-                    self.status.target_detected = False
+                    if self.status.mode == TrackingMode.TRACKING:
+                        self.status.mode = TrackingMode.SCANNING
+                        self.logger.info("🔍 対象ロスト - スキャンモードに切り替え")
                     
-                    # 一定時間検出されない場合はスキャンモードに切り替え
-                    if (self.status.last_detection_time and 
-                        (datetime.now() - self.status.last_detection_time).total_seconds() > self.lost_target_timeout):
-                        
-                        if self.status.mode == TrackingMode.TRACKING:
-                            self.status.mode = TrackingMode.SCANNING
-                            self.logger.info("🔍 対象ロスト - スキャンモードに切り替え")
-                        
-                        # スキャン動作（簡単な左右スイープ）
-                        self._execute_scan_pattern()
-                
+                    # スキャン動作（簡単な左右スイープ）
+                    self._execute_scan_pattern()
+            
         except Exception as e:
-            self.logger.error(f"追跡制御更新でエラー: {e}")
+            self._record_error("追跡制御更新でエラー", e)
     
     def _execute_scan_pattern(self) -> None:
         """スキャンパターンの実行（簡単な左右スイープ）"""
         try:
             current_time = time.time()
             # 10秒周期でゆっくりと左右にスイープ
-            angle_offset = 30 * np.sin(current_time * 0.1)  # ±30度の範囲
+            angle_offset = 30 * math.sin(current_time * 0.1)  # ±30度の範囲（スカラーなのでmath.sin）
             
             new_pan = angle_offset
             if self.servo_controller.is_angle_safe(new_pan, 0):
-                self.servo_controller.set_angles(new_pan, 0)
+                self.servo_controller.set_target(new_pan, 0)
+                if self.yolo_detector:
+                    self.yolo_detector.invalidate_previous_result()
                 self.status.pan_angle = new_pan
                 self.status.tilt_angle = 0
                 
         except Exception as e:
-            self.logger.error(f"スキャンパターン実行でエラー: {e}")
+            self._record_error("スキャンパターン実行でエラー", e)
     
     def _create_display_frame(self, frame: np.ndarray, detections: List[Dict]) -> np.ndarray:
         """
@@ -370,7 +615,8 @@ class TrackingCoordinator:
         Returns:
             np.ndarray: 表示用フレーム
         """
-        display_frame = frame.copy()
+        # 元フレームは以降使わないため、コピーせずに直接描画する
+        display_frame = frame
         
         try:
             # 検出結果の描画
@@ -396,19 +642,45 @@ class TrackingCoordinator:
                 center_y = int((bbox[1] + bbox[3]) / 2)
                 cv2.circle(display_frame, (center_x, center_y), 5, (0, 0, 255), -1)
             
-            # 画面中央の十字線描画
-            center_x, center_y = self.image_width // 2, self.image_height // 2
-            cv2.line(display_frame, (center_x - 20, center_y), (center_x + 20, center_y), (255, 255, 255), 1)
-            cv2.line(display_frame, (center_x, center_y - 20), (center_x, center_y + 20), (255, 255, 255), 1)
+            # 画面中央の十字線・操作説明（事前描画した画素を書き込むだけ）
+            indices, values = self._get_static_overlay(display_frame.shape)
+            display_frame[indices] = values
             
             # システム状態表示
             self._draw_system_info(display_frame)
             
         except Exception as e:
-            self.logger.error(f"表示フレーム作成でエラー: {e}")
+            self._record_error("表示フレーム作成でエラー", e)
         
         return display_frame
     
+    def _get_static_overlay(self, shape: Tuple[int, ...]) -> Tuple[Tuple[np.ndarray, ...], np.ndarray]:
+        """
+        変化しない表示要素を一度だけ描画し、描画された画素の位置と色を返す
+        
+        Args:
+            shape: 表示フレームの形状
+            
+        Returns:
+            Tuple: (描画画素のインデックス, 画素の色)
+        """
+        if self._static_overlay is None or self._static_overlay[0] != shape:
+            overlay = np.zeros(shape, dtype=np.uint8)
+            
+            # 画面中央の十字線
+            center_x, center_y = self.image_width // 2, self.image_height // 2
+            cv2.line(overlay, (center_x - 20, center_y), (center_x + 20, center_y), (255, 255, 255), 1)
+            cv2.line(overlay, (center_x, center_y - 20), (center_x, center_y + 20), (255, 255, 255), 1)
+            
+            # 操作説明（システム情報の最終行の位置）
+            cv2.putText(overlay, "Press 'q' to quit", (10, 30 + 8 * 25),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+            
+            indices = np.nonzero(overlay.any(axis=2))
+            self._static_overlay = (shape, indices, overlay[indices])
+        
+        return self._static_overlay[1], self._static_overlay[2]
+    
     def _draw_system_info(self, frame: np.ndarray) -> None:
         """システム情報をフレームに描画"""
         try:
@@ -418,8 +690,8 @@ class TrackingCoordinator:
             color = (255, 255, 255)
             thickness = 1
             
-            # システム情報
-            info_lines = [
+            # システム情報（表示文字列のタプルをキャッシュのキーにする）
+            info_lines = (
                 f"Mode: {self.status.mode.value.upper()}",
                 f"Target: {'YES' if self.status.target_detected else 'NO'}",
                 f"Class: {self.status.target_class}",
@@ -427,47 +699,70 @@ class TrackingCoordinator:
                 f"Pan: {self.status.pan_angle:.1f}°",
                 f"Tilt: {self.status.tilt_angle:.1f}°",
                 f"Correction: ({self.status.correction_applied[0]:.2f}, {self.status.correction_applied[1]:.2f})",
-                f"Detections: {self.status.total_detections}",
-                "Press 'q' to quit"
-            ]
+                f"Detections: {self.status.total_detections}"
+            )
             
-            for i, line in enumerate(info_lines):
-                y_pos = y_offset + (i * 25)
-                cv2.putText(frame, line, (10, y_pos), font, font_scale, color, thickness)
+            # 表示内容が変わった時だけ黒背景のバッファに描画し直す
+            height = min(frame.shape[0], y_offset + (len(info_lines) - 1) * 25 + 10)
+            overlay_shape = (height, frame.shape[1], frame.shape[2])
+            if self._info_overlay is None or self._info_overlay.shape != overlay_shape:
+                self._info_overlay = np.zeros(overlay_shape, dtype=np.uint8)
+                self._info_overlay_key = None
+            
+            if info_lines != self._info_overlay_key:
+                self._info_overlay.fill(0)
+                for i, line in enumerate(info_lines):
+                    y_pos = y_offset + (i * 25)
+                    cv2.putText(self._info_overlay, line, (10, y_pos), font, font_scale, color, thickness)
+                self._info_overlay_key = info_lines
+            
+            # 白文字なので飽和加算すれば上書き描画と同じ結果になる
+            region = frame[:height]
+            cv2.add(region, self._info_overlay, dst=region)
                 
         except Exception as e:
-            self.logger.error(f"システム情報描画でエラー: {e}")
+            self._record_error("システム情報描画でエラー", e)
     
     def _update_system_status(self, detections: List[Dict]) -> None:
         """システム状態更新"""
         try:
-            with self.lock:
-                # 検出回数更新
-                if detections:
-                    self.status.total_detections += 1
-                
-                # 追跡時間更新
-                if self.system_start_time:
-                    self.status.tracking_duration = (datetime.now() - self.system_start_time).total_seconds()
-                
+            # 検出回数更新（追跡時間は毎フレーム更新せず、参照時に計算）
+            if detections:
+                self.status.total_detections += 1
+            
+            self._publish_status()
+            
         except Exception as e:
-            self.logger.error(f"システム状態更新でエラー: {e}")
+            self._record_error("システム状態更新でエラー", e)
+    
+    def _publish_status(self) -> None:
+        """現在の状態のコピーをスナップショットとして公開"""
+        # 参照の代入は1命令で行われるため、読み出し側が更新途中の状態を見ることはない
+        self._status_snapshot = replace(self.status)
     
     def get_system_status(self) -> Dict:
         """システム状態取得"""
-        with self.lock:
-            return {
-                'mode': self.status.mode.value,
-                'target_detected': self.status.target_detected,
-                'target_class': self.status.target_class,
-                'target_confidence': self.status.target_confidence,
-                'pan_angle': self.status.pan_angle,
-                'tilt_angle': self.status.tilt_angle,
-                'correction_applied': self.status.correction_applied,
-                'total_detections': self.status.total_detections,
-                'tracking_duration': self.status.tracking_duration,
-                'is_running': self.is_running
-            }
+        # 制御スレッドを待たせないよう、ロックを取らずに最新のスナップショットを読む
+        status = self._status_snapshot
+        
+        # 追跡時間は参照された時だけ計算（停止後は停止時刻までの時間）
+        tracking_duration = status.tracking_duration
+        if self.system_start_time is not None:
+            end_time = self.system_stop_time if self.system_stop_time is not None else time.monotonic()
+            tracking_duration = end_time - self.system_start_time
+        
+        return {
+            'mode': status.mode.value,
+            'target_detected': status.target_detected,
+            'target_class': status.target_class,
+            'target_confidence': status.target_confidence,
+            'pan_angle': status.pan_angle,
+            'tilt_angle': status.tilt_angle,
+            'correction_applied': status.correction_applied,
+            'total_detections': status.total_detections,
+            'tracking_duration': tracking_duration,
+            'is_running': self.is_running
+        }
     
     def _cleanup_resources(self) -> None:
         """リソース解放"""
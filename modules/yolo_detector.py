@@ -23,11 +23,18 @@ YOLO検出モジュール - YOLOv8による犬猫検出
 - カメラが正しく接続されていることを確認してください
 """
 
+import os
+import re
 import cv2
+import shutil
 import time
 import logging
+import platform
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from pathlib import Path
+from itertools import islice
+from collections import deque
+from typing import Iterable, List, Dict, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
 
@@ -39,6 +46,47 @@ except ImportError as e:
     print("pip install ultralytics")
     raise
 
+# Numba（JITコンパイラ）はオプション：インストールされていない場合はPython実装で計算
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# 推論バックエンドとultralyticsのエクスポート形式の対応（Noneは元の.ptモデルをそのまま使用）
+BACKEND_FORMATS = {
+    "pytorch": None,
+    "onnx": "onnx",
+    "openvino": "openvino",
+    "tflite": "tflite",
+    "tensorrt": "engine",
+}
+
+# 対応する推論精度
+PRECISIONS = ("fp32", "fp16", "int8")
+
+# TensorRTエンジン構築時の作業メモリ（GB）
+TENSORRT_WORKSPACE_GB = 2
+
+# INT8量子化のキャリブレーション用データセット（camera_detection_test.pyと共通、save_calibration_datasetで作成）
+CALIBRATION_DIR = "calibration_data"
+CALIBRATION_IMAGE_DIR = os.path.join(CALIBRATION_DIR, "images")
+CALIBRATION_YAML = os.path.join(CALIBRATION_DIR, "calibration.yaml")
+CALIBRATION_FRAMES = 200
+
+# クラスIDのマスクの最小サイズ（COCO datasetのクラス数）
+COCO_CLASS_COUNT = 80
+
+# 静止シーン判定用の縮小グレー画像サイズ（幅, 高さ）
+MOTION_THUMBNAIL_SIZE = (64, 48)
+
+# 静止シーンとみなす画素あたりの平均輝度差（0で判定を無効化）
+MOTION_THRESHOLD = 1.0
+
+# 静止シーンで前回の検出結果を再利用する最大時間（秒）
+MOTION_MAX_REUSE_TIME = 0.5
+
 
 class DetectorError(Exception):
     """YOLO検出器固有の例外"""
@@ -64,9 +112,86 @@ class Detection:
     center: Tuple[float, float] = None  # バウンディングボックスの中心座標
     
     def __post_init__(self):
-        """中心座標の自動計算"""
-        x1, y1, x2, y2 = self.bbox
-        self.center = ((x1 + x2) / 2.0, (y1 + y2) / 2.0)
+        """中心座標の自動計算（計算済みの場合はそのまま使用）"""
+        if self.center is None:
+            x1, y1, x2, y2 = self.bbox
+            self.center = ((x1 + x2) / 2.0, (y1 + y2) / 2.0)
+
+
+def _decode_boxes(boxes: np.ndarray, target_mask: np.ndarray,
+                  conf_threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    検出ボックスの絞り込みと中心座標の計算
+    
+    Args:
+        boxes: 形状(N, 6)のfloat32配列 [x1, y1, x2, y2, confidence, class_id]
+        target_mask: クラスIDごとの対象フラグ
+        conf_threshold: 信頼度閾値
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (残すボックスのインデックス, 形状(K, 2)の中心座標)
+    """
+    n = boxes.shape[0]
+    keep = np.empty(n, dtype=np.int64)
+    centers = np.empty((n, 2), dtype=np.float64)
+    count = 0
+    
+    for i in range(n):
+        class_id = int(boxes[i, 5])
+        if class_id < 0 or class_id >= target_mask.shape[0] or not target_mask[class_id]:
+            continue
+        if boxes[i, 4] < conf_threshold:
+            continue
+        
+        # 中心座標はDetectionと同じく整数化したバウンディングボックスから計算
+        keep[count] = i
+        centers[count, 0] = (int(boxes[i, 0]) + int(boxes[i, 2])) / 2.0
+        centers[count, 1] = (int(boxes[i, 1]) + int(boxes[i, 3])) / 2.0
+        count += 1
+    
+    return keep[:count], centers[:count]
+
+
+if NUMBA_AVAILABLE:
+    # 型を指定してインポート時にコンパイル（初回検出時の遅延を回避）
+    # キャッシュはモジュール名が異なる実行（単体実行など）と共有すると壊れるため使用しない
+    _decode_boxes = njit("Tuple((i8[:], f8[:, :]))(f4[:, :], b1[:], f4)", fastmath=True)(_decode_boxes)
+
+
+def save_calibration_dataset(frames: Iterable[np.ndarray], model_path: str) -> int:
+    """
+    INT8キャリブレーション用データセットの保存（camera_detection_test.pyと共通）
+    
+    前回取得した画像が混ざらないように、画像ディレクトリを空にしてから保存します。
+    
+    Args:
+        frames: 保存するフレーム
+        model_path: クラス名を取得するモデルのパス
+        
+    Returns:
+        int: 保存したフレーム数（0枚の場合はデータセット定義ファイルを作成しない）
+    """
+    shutil.rmtree(CALIBRATION_IMAGE_DIR, ignore_errors=True)
+    os.makedirs(CALIBRATION_IMAGE_DIR, exist_ok=True)
+    
+    saved_count = 0
+    for frame in frames:
+        cv2.imwrite(os.path.join(CALIBRATION_IMAGE_DIR, f"calib_{saved_count:03d}.jpg"), frame)
+        saved_count += 1
+    
+    if saved_count == 0:
+        return 0
+    
+    # クラス名はモデルの定義をそのまま使用（COCO 80クラス）
+    names = YOLO(model_path).names
+    with open(CALIBRATION_YAML, "w") as f:
+        f.write(f"path: {os.path.abspath(CALIBRATION_DIR)}\n")
+        f.write("train: images\n")
+        f.write("val: images\n")
+        f.write("names:\n")
+        for class_id, class_name in names.items():
+            f.write(f"  {class_id}: {class_name}\n")
+    return saved_count
 
 
 class YOLODetector:
@@ -81,7 +206,10 @@ class YOLODetector:
                  model_path: str = "yolov8n.pt",
                  confidence_threshold: float = 0.5,
                  target_classes: List[int] = None,
-                 image_size: Tuple[int, int] = (640, 480)):
+                 image_size: Tuple[int, int] = (640, 480),
+                 backend: str = "pytorch",
+                 precision: str = "fp32",
+                 motion_threshold: float = MOTION_THRESHOLD):
         """
         YOLO検出器初期化
         
@@ -89,18 +217,35 @@ class YOLODetector:
             model_path: YOLOv8モデルファイルパス
             confidence_threshold: 信頼度閾値
             target_classes: 対象クラスID（None時は犬猫のみ）
-            image_size: 処理画像サイズ
+            image_size: 処理画像サイズ（推論時の入力サイズもこれに合わせる）
+            backend: 推論バックエンド（"auto", "pytorch", "onnx", "openvino", "tflite", "tensorrt"）
+            precision: 推論精度（"fp32", "fp16", "int8"、pytorch以外で有効）
+            motion_threshold: 静止シーンとみなす平均輝度差（前回推論時のフレームとの差がこれ未満なら推論を省略、0で無効）
         """
+        if backend != "auto" and backend not in BACKEND_FORMATS:
+            raise DetectorError(f"未対応の推論バックエンドです: {backend}")
+        if precision not in PRECISIONS:
+            raise DetectorError(f"未対応の推論精度です: {precision}")
+        
         # 基本パラメータ
         self.model_path = model_path
+        self.backend = backend
+        self.precision = precision
+        self.active_backend = None  # 実際に使用しているバックエンド（読み込み後に設定）
         self.confidence_threshold = confidence_threshold
         self.image_size = image_size
+        # YOLOの推論入力サイズ（長辺を32の倍数に切り上げ）
+        self.inference_size = ((max(image_size) + 31) // 32) * 32
         
         # 対象クラスの設定（COCO dataset）
         if target_classes is None:
             self.target_classes = [15, 16]  # cat, dog
         else:
             self.target_classes = target_classes
+        # クラスIDで引ける対象フラグ（後処理での絞り込み用）
+        self._target_mask = np.zeros(max([COCO_CLASS_COUNT] + [cid + 1 for cid in self.target_classes]),
+                                     dtype=np.bool_)
+        self._target_mask[self.target_classes] = True
         
         # COCO class names
         self.class_names = {
@@ -114,14 +259,25 @@ class YOLODetector:
             16: (255, 0, 0),    # 犬: 青色
         }
         
+        # ラベル文字サイズのキャッシュ（信頼度は小数2桁表示のため、クラスごとに最大101種類）
+        self._text_size_cache = {}
+        
+        # 静止シーンの推論省略
+        # 前回推論時の(縮小画像, 推論時刻, ボックス, 中心座標)を1つのタプルで保持（別スレッドからの無効化と整合させるため）
+        self.motion_threshold = motion_threshold
+        self._motion_reference = None
+        self._motion_generation = 0  # 無効化のたびに増加（推論中に無効化された結果を保持しないため）
+        self.skipped_inferences = 0
+        
         # モデルインスタンス
         self.model = None
         self.status = DetectorStatus.UNINITIALIZED
         
         # 検出統計
         self.total_detections = 0
-        self.detection_history = []  # 最近の検出結果履歴
-        self.processing_times = []   # 処理時間履歴
+        self.detection_history = deque(maxlen=1000)  # 最近の検出結果履歴（最新1000フレーム分のみ保持）
+        self.processing_times = deque(maxlen=100)    # 処理時間履歴（最新100フレーム分のみ保持）
+        self._processing_time_sum = 0.0              # 処理時間履歴の合計（平均をO(1)で求めるため）
         
         # パフォーマンス監視
         self.fps_counter = 0
@@ -142,12 +298,33 @@ class YOLODetector:
             self.status = DetectorStatus.LOADING
             self.logger.info(f"YOLOv8モデルを読み込み中: {self.model_path}")
             
+            # 推論バックエンド用のモデルを準備
+            # INT8で準備できない場合はFP16、それも失敗した場合は元のモデルで推論
+            model_path = self.model_path
+            self.active_backend = self._resolve_backend()
+            if BACKEND_FORMATS[self.active_backend] is not None:
+                self.precision = self._supported_precision(self.active_backend, self.precision)
+                precisions = [self.precision] + (["fp16"] if self.precision == "int8" else [])
+                for precision in precisions:
+                    self.precision = precision
+                    try:
+                        model_path = self._prepare_exported_model(self.active_backend)
+                        break
+                    except Exception as e:
+                        self.logger.warning(
+                            f"{self.active_backend}形式（{precision}）のモデルを準備できませんでした: {e}")
+                else:
+                    self.logger.warning("PyTorchモデルで推論します")
+                    self.active_backend = "pytorch"
+                    self.precision = "fp32"
+            
             # モデルの読み込み（初回実行時は自動ダウンロード）
-            self.model = YOLO(self.model_path)
+            self.model = YOLO(model_path, task="detect")
             
             # モデル情報の表示
             self.logger.info("モデルの読み込みが完了しました")
-            self.logger.info(f"  モデル: {self.model_path}")
+            self.logger.info(f"  モデル: {model_path}")
+            self.logger.info(f"  バックエンド: {self.active_backend} ({self.precision})")
             self.logger.info(f"  信頼度閾値: {self.confidence_threshold}")
             self.logger.info(f"  対象クラス: {[self.class_names.get(cid, f'ID{cid}') for cid in self.target_classes]}")
             
@@ -159,6 +336,172 @@ class YOLODetector:
             self.logger.error(f"モデル読み込み中にエラー: {e}")
             return False
     
+    def _resolve_backend(self) -> str:
+        """
+        使用する推論バックエンドの決定
+        
+        "auto"指定時はCUDA GPUがあればTensorRT、Raspberry Pi等のARM環境ではTFLite、
+        それ以外ではOpenVINOを選択します。
+        
+        Returns:
+            str: 推論バックエンド名
+        """
+        if self.backend != "auto":
+            return self.backend
+        
+        if self._cuda_device_name() is not None:
+            return "tensorrt"
+        
+        machine = platform.machine().lower()
+        if machine.startswith(("arm", "aarch64")):
+            return "tflite"
+        return "openvino"
+    
+    def _supported_precision(self, backend: str, precision: str) -> str:
+        """
+        エクスポート形式が対応していない推論精度の置き換え
+        
+        ultralyticsのONNXエクスポートはINT8量子化に対応しておらず、FP16はGPUでのみ
+        エクスポートできるため、エクスポート前にFP32へ変更します（ファイル名・ログを実際の精度に合わせる）。
+        
+        Args:
+            backend: 推論バックエンド名
+            precision: 指定された推論精度
+            
+        Returns:
+            str: エクスポートに使用する推論精度
+        """
+        if backend == "onnx" and (precision == "int8" or
+                                  (precision == "fp16" and self._cuda_device_name() is None)):
+            self.logger.warning(f"onnx形式は{precision}でエクスポートできないため、fp32を使用します")
+            return "fp32"
+        return precision
+    
+    def _exported_model_path(self, backend: str) -> Path:
+        """
+        エクスポート済みモデルの保存先
+        
+        入力サイズを固定してエクスポートするため、入力サイズと精度（TensorRTはGPUも）ごとに
+        別の名前で保存し、設定を変更した場合は自動的に再エクスポートされるようにします。
+        
+        Args:
+            backend: 推論バックエンド名
+            
+        Returns:
+            Path: エクスポート済みモデルのパス
+        """
+        model_path = Path(self.model_path)
+        name = f"{model_path.stem}_{self.inference_size}_{self.precision}"
+        
+        if backend == "openvino":
+            # ultralyticsはディレクトリ名の末尾で形式を判定するため、末尾は変更しない
+            return model_path.with_name(f"{name}_openvino_model")
+        if backend == "tensorrt":
+            # TensorRTエンジンはGPUごとにも作り直す必要がある
+            gpu_name = re.sub(r"[^0-9A-Za-z]+", "_", self._cuda_device_name() or "gpu").strip("_")
+            return model_path.with_name(f"{name}_{gpu_name}.engine")
+        return model_path.with_name(f"{name}.{BACKEND_FORMATS[backend]}")
+    
+    def _prepare_exported_model(self, backend: str) -> str:
+        """
+        推論バックエンド用モデルの準備（未エクスポートの場合のみエクスポート）
+        
+        Args:
+            backend: 推論バックエンド名
+            
+        Returns:
+            str: 読み込むモデルのパス
+        """
+        exported_path = self._exported_model_path(backend)
+        if exported_path.exists():
+            return str(exported_path)
+        
+        # 初回のみエクスポート（INT8は量子化のキャリブレーションも行うため時間がかかります）
+        self.logger.info(f"モデルを{backend}形式（{self.precision}）にエクスポート中...")
+        export_args = {
+            'format': BACKEND_FORMATS[backend],
+            'imgsz': self.inference_size,
+            'int8': self.precision == "int8",
+            'half': self.precision == "fp16"
+        }
+        if self.precision == "int8" and os.path.isfile(CALIBRATION_YAML):
+            # 設置環境のカメラ映像でキャリブレーション（未作成時はUltralytics標準のデータセット）
+            export_args['data'] = CALIBRATION_YAML
+        if backend == "tensorrt":
+            # エンジンの構築には数分かかります
+            export_args.update(device=0, workspace=TENSORRT_WORKSPACE_GB)
+        elif backend == "onnx" and self.precision == "fp16":
+            # ONNXのFP16エクスポートはGPU上でのみ行える
+            export_args['device'] = 0
+        exported = YOLO(self.model_path).export(**export_args)
+        
+        # ultralyticsの出力先は入力サイズを区別しないため、区別用の名前に変更して保存
+        Path(exported).replace(exported_path)
+        return str(exported_path)
+    
+    def create_calibration_dataset(self, camera_id: int = 0,
+                                   frame_count: int = CALIBRATION_FRAMES,
+                                   interval: float = 0.1) -> Optional[str]:
+        """
+        カメラ映像からINT8キャリブレーション用データセットを作成
+        
+        実際の設置環境の映像を使うことで、量子化による精度低下を抑えます。
+        作成後のINT8エクスポートで自動的に使用されます（既存のエクスポート済みモデルは削除してください）。
+        
+        Args:
+            camera_id: カメラID
+            frame_count: 保存するフレーム数
+            interval: フレームの保存間隔（秒、似たフレームばかりにならないように）
+            
+        Returns:
+            str: データセット定義ファイル（YAML）のパス（失敗時はNone）
+        """
+        camera = cv2.VideoCapture(camera_id)
+        try:
+            if not camera.isOpened():
+                self.logger.error("カメラを開けませんでした")
+                return None
+            
+            def read_frames():
+                for _ in range(frame_count):
+                    ret, frame = camera.read()
+                    if not ret:
+                        return
+                    yield frame
+                    time.sleep(interval)
+            
+            self.logger.info(f"キャリブレーション用フレームを取得中 ({frame_count}枚)...")
+            saved_count = save_calibration_dataset(read_frames(), self.model_path)
+            if saved_count == 0:
+                self.logger.error("キャリブレーション用フレームを取得できませんでした")
+                return None
+            
+            self.logger.info(f"キャリブレーションデータを作成しました: {CALIBRATION_YAML} ({saved_count}枚)")
+            return CALIBRATION_YAML
+            
+        except Exception as e:
+            self.logger.error(f"キャリブレーションデータ作成中にエラー: {e}")
+            return None
+            
+        finally:
+            camera.release()
+    
+    @staticmethod
+    def _cuda_device_name() -> Optional[str]:
+        """
+        CUDA GPU名の取得
+        
+        Returns:
+            str: GPU名（CUDAが使えない場合はNone）
+        """
+        try:
+            import torch
+            if torch.cuda.is_available():
+                return torch.cuda.get_device_name(0)
+        except Exception:
+            pass
+        return None
+    
     def detect_pets(self, frame: np.ndarray) -> List[Detection]:
         """
         犬猫検出実行
@@ -179,50 +522,23 @@ class YOLODetector:
             self.status = DetectorStatus.DETECTING
             
             # YOLOv8で推論実行
-            results = self.model(frame, conf=self.confidence_threshold, verbose=False)
+            boxes, centers = self._infer_target_boxes(frame)
             
             detections = []
             
-            # 検出結果の解析
-            for result in results:
-                boxes = result.boxes
-                if boxes is not None:
-                    for box in boxes:
-                        # クラスID、信頼度、座標の取得
-                        class_id = int(box.cls[0])
-                        confidence = float(box.conf[0])
-                        x1, y1, x2, y2 = [int(coord) for coord in box.xyxy[0].tolist()]
-                        
-                        # 対象クラス（犬または猫）の場合のみ処理
-                        if class_id in self.target_classes:
-                            detection = Detection(
-                                class_id=class_id,
-                                class_name=self.class_names.get(class_id, f"Class_{class_id}"),
-                                confidence=confidence,
-                                bbox=(x1, y1, x2, y2)
-                            )
-                            detections.append(detection)
-            
-            # 処理時間の記録
-            processing_time = time.time() - detection_start_time
-            self.processing_times.append(processing_time)
-            
-            # 処理時間履歴の管理（最新100フレーム分のみ保持）
-            if len(self.processing_times) > 100:
-                self.processing_times.pop(0)
-            
-            # 検出履歴の更新
-            self.detection_history.append({
-                'timestamp': time.time(),
-                'count': len(detections),
-                'processing_time': processing_time
-            })
-            
-            # 検出履歴の管理（最新1000フレーム分のみ保持）
-            if len(self.detection_history) > 1000:
-                self.detection_history.pop(0)
-            
-            self.total_detections += len(detections)
+            # 検出結果の解析（対象クラスのボックスだけをPythonの値に変換）
+            for (x1, y1, x2, y2, confidence, class_id), center in zip(boxes.tolist(), centers.tolist()):
+                class_id = int(class_id)
+                detection = Detection(
+                    class_id=class_id,
+                    class_name=self.class_names.get(class_id, f"Class_{class_id}"),
+                    confidence=confidence,
+                    bbox=(int(x1), int(y1), int(x2), int(y2)),
+                    center=tuple(center)
+                )
+                detections.append(detection)
+            
+            self._record_detection(len(detections), detection_start_time)
             self.status = DetectorStatus.READY
             
             return detections
@@ -232,6 +548,184 @@ class YOLODetector:
             self.logger.error(f"検出処理中にエラー: {e}")
             return []
     
+    def detect_pets_array(self, frame: np.ndarray) -> np.ndarray:
+        """
+        犬猫検出実行（配列形式）
+        
+        検出結果をDetectionオブジェクトに変換せず、まとめて配列で返します。
+        複数の検出結果をNumPyで一括処理する場合に使用します。
+        
+        Args:
+            frame: 入力画像フレーム
+            
+        Returns:
+            np.ndarray: 形状(N, 6)のfloat32配列 [x1, y1, x2, y2, confidence, class_id]
+        """
+        if self.status != DetectorStatus.READY:
+            self.logger.warning(f"検出器が準備状態ではありません: {self.status}")
+            return np.empty((0, 6), dtype=np.float32)
+        
+        detection_start_time = time.time()
+        
+        try:
+            self.status = DetectorStatus.DETECTING
+            
+            # YOLOv8で推論実行
+            boxes, _ = self._infer_target_boxes(frame)
+            
+            self._record_detection(len(boxes), detection_start_time)
+            self.status = DetectorStatus.READY
+            
+            return boxes
+            
+        except Exception as e:
+            self.status = DetectorStatus.ERROR
+            self.logger.error(f"検出処理中にエラー: {e}")
+            return np.empty((0, 6), dtype=np.float32)
+    
+    def _infer_target_boxes(self, frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        推論を実行して対象クラスのボックスを取得
+        
+        前回推論時のフレームからほとんど変化していない場合（ペットが寝ているなど）は、
+        MOTION_MAX_REUSE_TIME以内に限り推論を省略して前回の結果を返します。
+        
+        Args:
+            frame: 入力画像フレーム
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (形状(N, 6)のボックス配列, 形状(N, 2)の中心座標)
+        """
+        thumbnail = None
+        generation = self._motion_generation
+        if self.motion_threshold > 0:
+            thumbnail = self._motion_thumbnail(frame)
+            reference = self._reusable_reference(thumbnail)
+            if reference is not None:
+                self.skipped_inferences += 1
+                # 呼び出し側が座標を書き換えても保持している結果に影響しないようにコピーを返す
+                return reference[2].copy(), reference[3]
+        
+        results = self.model(frame, conf=self.confidence_threshold,
+                             imgsz=self.inference_size, verbose=False)
+        boxes, centers = self._extract_target_boxes(results)
+        
+        # 推論中にサーボが動いた（無効化された）場合、このフレームは基準にしない
+        if thumbnail is not None and generation == self._motion_generation:
+            self._motion_reference = (thumbnail, time.monotonic(), boxes.copy(), centers)
+        
+        return boxes, centers
+    
+    def invalidate_previous_result(self) -> None:
+        """
+        前回の検出結果の再利用を中止
+        
+        カメラの向きを変えた場合は、画像の変化が小さくても前回の座標は使えないため、
+        サーボへ指令を出すたびに呼び出してください。次のフレームは必ず推論します。
+        """
+        self._motion_generation += 1
+        self._motion_reference = None
+    
+    @staticmethod
+    def _motion_thumbnail(frame: np.ndarray) -> np.ndarray:
+        """
+        静止シーン判定用の縮小グレー画像を作成
+        
+        Args:
+            frame: 入力画像フレーム（BGRまたはグレー）
+            
+        Returns:
+            np.ndarray: MOTION_THUMBNAIL_SIZEのグレー画像
+        """
+        # 先に縮小してから色変換（変換する画素数を減らす）
+        small = cv2.resize(frame, MOTION_THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small
+    
+    def _reusable_reference(self, thumbnail: np.ndarray) -> Optional[tuple]:
+        """
+        前回推論時のフレームから変化していない場合にその推論結果を取得
+        
+        Args:
+            thumbnail: 現在フレームの縮小グレー画像
+            
+        Returns:
+            tuple: 再利用できる(縮小画像, 推論時刻, ボックス, 中心座標)（再利用できない場合はNone）
+        """
+        reference = self._motion_reference
+        if reference is None:
+            return None
+        if time.monotonic() - reference[1] >= MOTION_MAX_REUSE_TIME:
+            return None
+        
+        # 画素あたりの平均輝度差で判定
+        difference = cv2.norm(thumbnail, reference[0], cv2.NORM_L1)
+        if difference >= self.motion_threshold * thumbnail.size:
+            return None
+        return reference
+    
+    def _extract_target_boxes(self, results) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        推論結果から対象クラスのボックスを配列で取得
+        
+        ボックスごとにテンソルを読み出すとその都度GPUとの同期と小さな変換が発生するため、
+        結果ごとに1回の転送でまとめて取得し、_decode_boxesで一括して絞り込みます。
+        
+        Args:
+            results: YOLOの推論結果
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (形状(N, 6)のfloat32配列 [x1, y1, x2, y2, confidence, class_id],
+                                            形状(N, 2)の中心座標)
+        """
+        arrays = [result.boxes.data.cpu().numpy() for result in results
+                  if result.boxes is not None]
+        if not arrays:
+            return np.empty((0, 6), dtype=np.float32), np.empty((0, 2), dtype=np.float64)
+        
+        boxes = np.ascontiguousarray(np.concatenate(arrays), dtype=np.float32)
+        
+        # 対象クラス（犬または猫）かつ信頼度閾値以上のみ抽出
+        keep, centers = _decode_boxes(boxes, self._target_mask, np.float32(self.confidence_threshold))
+        return boxes[keep], centers
+    
+    def _record_detection(self, count: int, detection_start_time: float) -> None:
+        """
+        検出統計の記録
+        
+        Args:
+            count: 検出数
+            detection_start_time: 検出開始時刻
+        """
+        # 処理時間の記録
+        processing_time = time.time() - detection_start_time
+        # 履歴から押し出される値を合計から差し引いてから追加
+        if len(self.processing_times) == self.processing_times.maxlen:
+            self._processing_time_sum -= self.processing_times[0]
+        self.processing_times.append(processing_time)
+        self._processing_time_sum += processing_time
+        
+        # 検出履歴の更新（古い履歴はdequeが自動的に破棄）
+        self.detection_history.append({
+            'timestamp': time.time(),
+            'count': count,
+            'processing_time': processing_time
+        })
+        
+        self.total_detections += count
+    
+    def _average_processing_time(self) -> float:
+        """
+        処理時間の平均（履歴の合計から計算）
+        
+        Returns:
+            float: 平均処理時間（秒、履歴がない場合は0）
+        """
+        if not self.processing_times:
+            return 0.0
+        return self._processing_time_sum / len(self.processing_times)
+    
     def get_best_detection(self, detections: List[Detection]) -> Optional[Detection]:
         """
         最も信頼度の高い検出結果を取得
@@ -284,18 +778,20 @@ class YOLODetector:
         
         return (pan_error, tilt_error)
     
-    def draw_detections(self, frame: np.ndarray, detections: List[Detection]) -> np.ndarray:
+    def draw_detections(self, frame: np.ndarray, detections: List[Detection],
+                        inplace: bool = False) -> np.ndarray:
         """
         検出結果の描画（デバッグ用）
         
         Args:
             frame: 入力画像フレーム
             detections: 検出結果のリスト
+            inplace: Trueの場合はコピーせず入力フレームに直接描画
             
         Returns:
             np.ndarray: 描画済みフレーム
         """
-        drawn_frame = frame.copy()
+        drawn_frame = frame if inplace else frame.copy()
         
         for detection in detections:
             x1, y1, x2, y2 = detection.bbox
@@ -312,8 +808,7 @@ class YOLODetector:
             label = f"{detection.class_name} {detection.confidence:.2f}"
             
             # ラベル背景の描画
-            (text_width, text_height), baseline = cv2.getTextSize(
-                label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+            (text_width, text_height), baseline = self._measure_label(label)
             cv2.rectangle(drawn_frame, (x1, y1 - text_height - 10), 
                          (x1 + text_width, y1), color, -1)
             
@@ -323,14 +818,32 @@ class YOLODetector:
         
         return drawn_frame
     
+    def _measure_label(self, label: str) -> Tuple[Tuple[int, int], int]:
+        """
+        ラベル文字サイズの取得（同じラベルは前回の計算結果を使用）
+        
+        Args:
+            label: ラベル文字列
+            
+        Returns:
+            Tuple[Tuple[int, int], int]: ((幅, 高さ), ベースライン)
+        """
+        text_size = self._text_size_cache.get(label)
+        if text_size is None:
+            text_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+            self._text_size_cache[label] = text_size
+        return text_size
+    
     def draw_tracking_info(self, frame: np.ndarray, 
-                          image_center: Tuple[float, float] = None) -> np.ndarray:
+                          image_center: Tuple[float, float] = None,
+                          inplace: bool = False) -> np.ndarray:
         """
         追跡情報の描画（デバッグ用）
         
         Args:
             frame: 入力画像フレーム
             image_center: 画像中心座標（None時は自動計算）
+            inplace: Trueの場合はコピーせず入力フレームに直接描画
             
         Returns:
             np.ndarray: 情報描画済みフレーム
@@ -341,7 +854,7 @@ class YOLODetector:
         if image_center is None:
             image_center = (width // 2, height // 2)
         
-        drawn_frame = frame.copy()
+        drawn_frame = frame if inplace else frame.copy()
         
         # 画像中心の描画（十字線）
         center_x, center_y = int(image_center[0]), int(image_center[1])
@@ -356,14 +869,14 @@ class YOLODetector:
                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
         
         # 検出統計表示
-        detection_count = len([d for d in self.detection_history[-10:] if d['count'] > 0])
+        detection_count = sum(1 for d in islice(reversed(self.detection_history), 10) if d['count'] > 0)
         stats_text = f"Detections: {detection_count}/10"
         cv2.putText(drawn_frame, stats_text, (10, 60), 
                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
         
         # 平均処理時間表示
         if self.processing_times:
-            avg_time = np.mean(self.processing_times)
+            avg_time = self._average_processing_time()
             time_text = f"Process: {avg_time*1000:.1f}ms"
             cv2.putText(drawn_frame, time_text, (10, 90), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
@@ -377,15 +890,16 @@ class YOLODetector:
         Returns:
             Dict: 統計情報
         """
-        recent_detections = self.detection_history[-100:]  # 最新100フレーム
+        recent_detections = list(islice(reversed(self.detection_history), 100))  # 最新100フレーム
         
         stats = {
             'total_detections': self.total_detections,
             'recent_detection_rate': len([d for d in recent_detections if d['count'] > 0]) / max(len(recent_detections), 1),
-            'average_processing_time': np.mean(self.processing_times) if self.processing_times else 0,
+            'average_processing_time': self._average_processing_time(),
             'current_fps': self.current_fps,
             'model_path': self.model_path,
             'confidence_threshold': self.confidence_threshold,
+            'skipped_inferences': self.skipped_inferences,
             'status': self.status.value
         }
         
@@ -400,6 +914,7 @@ class YOLODetector:
         """
         if 0.0 <= threshold <= 1.0:
             self.confidence_threshold = threshold
+            self.invalidate_previous_result()  # 閾値変更後は前回の検出結果を再利用しない
             self.logger.info(f"信頼度閾値を変更: {threshold}")
         else:
             self.logger.warning(f"信頼度閾値が範囲外です: {threshold}")
@@ -427,6 +942,7 @@ class YOLODetector:
             if self.model:
                 del self.model
                 self.model = None
+            self.invalidate_previous_result()
             
             self.status = DetectorStatus.UNINITIALIZED
             self.logger.info("YOLO検出器のクリーンアップが完了しました")
@@ -446,15 +962,30 @@ def create_yolo_detector(model_path: str = "yolov8n.pt") -> YOLODetector:
 
 if __name__ == "__main__":
     # モジュール単体テスト用
+    import sys
     import logging
+    import argparse
     
     logging.basicConfig(level=logging.INFO)
     
-    print("YOLODetectorモジュール単体テスト")
-    print("=" * 40)
+    parser = argparse.ArgumentParser(description="YOLODetectorモジュール単体テスト")
+    parser.add_argument('--capture-calibration', action='store_true',
+                        help='INT8キャリブレーション用のフレームをカメラから保存して終了')
+    parser.add_argument('--camera-id', type=int, default=0, help='カメラID (デフォルト: 0)')
+    parser.add_argument('--frames', type=int, default=CALIBRATION_FRAMES,
+                        help=f'キャリブレーション用フレーム数 (デフォルト: {CALIBRATION_FRAMES})')
+    args = parser.parse_args()
     
     detector = YOLODetector()
     
+    if args.capture_calibration:
+        yaml_path = detector.create_calibration_dataset(args.camera_id, args.frames)
+        print(f"キャリブレーションデータ: {yaml_path}" if yaml_path else "キャリブレーションデータの作成に失敗しました")
+        sys.exit(0 if yaml_path else 1)
+    
+    print("YOLODetectorモジュール単体テスト")
+    print("=" * 40)
+    
     try:
         if detector.load_model():
             print("モデル読み込み成功")
@@ -111,11 +111,9 @@ class ServoPositionSetup:
         try:
             print(f"\n両サーボを中央位置（パン:{self.PAN_CENTER}度、チルト:{self.TILT_CENTER}度）に移動中...")
             
-            # servo_test.pyと同じ方法で移動
+            # 両軸に指令を出してからまとめて安定待機（各サーボは独立して動くため並行して移動）
             print(f"パン: {self.PAN_CENTER}度に移動")
             self.pan_servo.angle = self.PAN_CENTER
-            time.sleep(self.SETTLE_DELAY)
-            
             print(f"チルト: {self.TILT_CENTER}度に移動")
             self.tilt_servo.angle = self.TILT_CENTER
             time.sleep(self.SETTLE_DELAY)
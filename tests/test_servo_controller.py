@@ -12,7 +12,9 @@
 4. 同時角度設定テスト
 5. 動作テスト
 6. エラーハンドリングテスト
-7. クリーンアップテスト
+7. 移動中の目標角度設定テスト
+8. 書き込み中の緊急停止テスト
+9. クリーンアップテスト
 
 使用方法:
     python tests/test_servo_controller.py [--hardware]
@@ -85,6 +87,8 @@ class ServoControllerTester:
             self.test_safety_limits,
             self.test_movement_test,
             self.test_error_handling,
+            self.test_target_while_moving,
+            self.test_emergency_stop_during_write,
         ]
         
         passed_tests = 0
@@ -362,6 +366,91 @@ class ServoControllerTester:
         self.logger.info("✓ エラーハンドリングテスト完了")
         return True
     
+    def test_target_while_moving(self) -> bool:
+        """移動中（安定待機中）の目標角度設定テスト"""
+        self.logger.info("\n--- 移動中の目標角度設定テスト ---")
+        
+        moving_controller = ServoController()
+        moving_controller.status = ServoStatus.MOVING
+        
+        # 安定待機中の目標は警告を出さずに拒否されるべき
+        with patch.object(moving_controller.logger, 'warning') as mock_warning:
+            success = moving_controller.set_target(10.0, 5.0)
+        
+        if not success and not mock_warning.called and moving_controller._target is None:
+            self.logger.debug("✓ 移動中の目標が警告なしで拒否された")
+        else:
+            self.logger.error("✗ 移動中の目標設定の処理が異常")
+            return False
+        
+        # 単軸の直接指定は未書き込みの目標を破棄するべき（古い目標で上書きされないように）
+        direct_controller = ServoController()
+        direct_controller.pan_pwm = Mock()
+        direct_controller.duty_lut = [0] * 1801
+        direct_controller.status = ServoStatus.READY
+        direct_controller._target = (30.0, 10.0)
+        
+        if direct_controller.set_pan_angle(-10.0, wait=False) and direct_controller._target is None:
+            self.logger.debug("✓ 単軸の直接指定で未書き込みの目標が破棄された")
+        else:
+            self.logger.error("✗ 単軸の直接指定後も未書き込みの目標が残った")
+            return False
+        
+        self.logger.info("✓ 移動中の目標角度設定テスト完了")
+        return True
+    
+    def test_emergency_stop_during_write(self) -> bool:
+        """書き込みスレッドの書き込み中に緊急停止するテスト"""
+        self.logger.info("\n--- 書き込み中の緊急停止テスト ---")
+        
+        # I2C書き込みを記録（最初の書き込みはバスの取得に時間がかかるものとする）
+        writes = []
+        i2c = Mock()
+        i2c.write.side_effect = lambda payload: writes.append(bytes(payload))
+        
+        def enter_bus(*args):
+            if not enter_bus.called_once:
+                enter_bus.called_once = True
+                time.sleep(0.05)
+            return i2c
+        enter_bus.called_once = False
+        
+        controller = ServoController()
+        controller.pca = Mock()
+        controller.pca.i2c_device.__enter__ = Mock(side_effect=enter_bus)
+        controller.pca.i2c_device.__exit__ = Mock(return_value=False)
+        controller.duty_lut = [0] * 1801
+        controller.register_lut = [bytes(4)] * 1801
+        controller.burst_register = ServoController.PCA9685_LED0_ON_L
+        controller.status = ServoStatus.READY
+        controller._start_command_thread()
+        
+        try:
+            # 書き込みスレッドが目標を書き込んでいる最中に緊急停止
+            controller.set_target(30.0, 10.0)
+            time.sleep(0.01)
+            controller.emergency_stop()
+            time.sleep(0.1)
+            
+            all_off = bytes((ServoController.PCA9685_ALL_LED_OFF_H, ServoController.PCA9685_FULL_OFF))
+            if writes and writes[-1] == all_off and controller.get_status() == ServoStatus.ERROR:
+                self.logger.debug("✓ 緊急停止後にI2C書き込みが行われない")
+            else:
+                self.logger.error(f"✗ 緊急停止後にI2C書き込みが行われた: {writes}")
+                return False
+            
+            # 緊急停止後の直接指定も書き込まれないべき
+            if not controller.set_target(0.0, 0.0) and writes[-1] == all_off:
+                self.logger.debug("✓ 緊急停止後の目標が拒否された")
+            else:
+                self.logger.error("✗ 緊急停止後の目標が受け付けられた")
+                return False
+        finally:
+            controller._stop_command_thread()
+        
+        self.logger.info("✓ 書き込み中の緊急停止テスト完了")
+        return True
+    
     def test_cleanup(self) -> bool:
         """クリーンアップテスト"""
         self.logger.info("\n--- クリーンアップテスト ---")
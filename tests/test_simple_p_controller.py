@@ -19,6 +19,7 @@ import sys
 import os
 import logging
 import time
+import multiprocessing
 from unittest.mock import patch, MagicMock
 
 # プロジェクトルートをパスに追加
@@ -121,10 +122,27 @@ class TestSimpleProportionalController(unittest.TestCase):
         correction = self.controller.calculate_correction((323, 243))  # 3pixelの誤差
         self.assertEqual(correction, (0.0, 0.0))
         
+        # 不感帯内の補正は回数のみ記録され、性能履歴には残らない
+        self.assertEqual(self.controller.state.total_corrections, 1)
+        self.assertEqual(self.controller.state.deadband_corrections, 1)
+        self.assertEqual(len(self.controller.performance_history), 0)
+        
         # 不感帯外の誤差
         correction = self.controller.calculate_correction((327, 247))  # 7pixelの誤差
         self.assertNotEqual(correction, (0.0, 0.0))
     
+    def test_batch_correction(self):
+        """一括補正計算テスト（1件ずつの計算と一致すること）"""
+        centers = [(320, 240), (420, 320), (323, 243), (1000, -200), (220, 160)]
+        
+        corrections = self.controller.calculate_correction_batch(centers)
+        
+        self.assertEqual(corrections.shape, (len(centers), 2))
+        for center, batch_correction in zip(centers, corrections):
+            correction = self.controller.calculate_correction(center)
+            self.assertAlmostEqual(batch_correction[0], correction[0], places=6)
+            self.assertAlmostEqual(batch_correction[1], correction[1], places=6)
+    
     def test_bbox_tracking_error_calculation(self):
         """バウンディングボックス制御誤差計算テスト"""
         # 中央のバウンディングボックス
@@ -204,13 +222,41 @@ class TestSimpleProportionalController(unittest.TestCase):
         self.assertEqual(self.controller.state.last_error, (0.0, 0.0))
         self.assertEqual(len(self.controller.performance_history), 0)
     
+    def test_shared_output_buffer(self):
+        """共有メモリへの補正値出力テスト"""
+        output_buffer = multiprocessing.Array('d', 2)
+        controller = SimpleProportionalController(name="SharedOutput", output_buffer=output_buffer)
+        
+        # 補正値が戻り値と同じく共有メモリに書き込まれること
+        correction = controller.calculate_correction((420, 320))
+        self.assertEqual(tuple(output_buffer[:]), correction)
+        
+        # 不感帯内では補正なしが書き込まれること
+        controller.calculate_correction((321, 241))
+        self.assertEqual(tuple(output_buffer[:]), (0.0, 0.0))
+        
+        controller.cleanup()
+    
+    def test_warmup(self):
+        """慣らし実行テスト（実行後は状態が初期化されていること）"""
+        self.controller.warmup(iterations=5)
+        
+        self.assertEqual(self.controller.status, SimplePStatus.READY)
+        self.assertEqual(self.controller.state.total_corrections, 0)
+        self.assertEqual(self.controller.state.last_error, (0.0, 0.0))
+        self.assertEqual(len(self.controller.performance_history), 0)
+    
     def test_error_handling(self):
         """エラーハンドリングテスト"""
         # 不正な検出中心座標でのエラーハンドリング
-        with patch.object(self.controller, 'logger') as mock_logger:
-            # NumPyエラーを発生させる
-            with patch('numpy.clip', side_effect=Exception("Test error")):
-                correction = self.controller.calculate_correction((100, 100))
+        with patch('modules.simple_p_controller.logger') as mock_logger:
+            # 不正な座標は例外として送出されることを確認
+            with self.assertRaises(SimplePError):
+                self.controller.calculate_correction((100,))
+            
+            # 制御計算でエラーを発生させる
+            with patch('modules.simple_p_controller._p_kernel', side_effect=Exception("Test error")):
+                correction = self.controller.safe_calculate_correction((100, 100))
                 
                 # エラー時は(0.0, 0.0)を返すことを確認
                 self.assertEqual(correction, (0.0, 0.0))
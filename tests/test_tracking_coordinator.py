@@ -20,7 +20,6 @@ import time
 import threading
 from unittest.mock import patch, MagicMock, Mock
 import numpy as np
-from datetime import datetime
 
 # プロジェクトルートをパスに追加
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -174,15 +173,11 @@ class TestTrackingCoordinator(unittest.TestCase):
         
         # YOLODetectorをモック
         with patch.object(self.coordinator, 'yolo_detector') as mock_yolo:
-            # 検出結果をモック
-            mock_detection = {
-                'class_id': 16,
-                'class_name': 'Dog',
-                'confidence': 0.85,
-                'bbox': (100, 100, 200, 200)
-            }
-            mock_yolo.detect_pets.return_value = [mock_detection]
-            mock_yolo.get_best_detection.return_value = mock_detection
+            # 検出結果をモック [x1, y1, x2, y2, confidence, class_id]
+            # 検出器には縮小フレーム（320x240）が渡されるため、座標も縮小後の値
+            mock_yolo.detect_pets_array.return_value = np.array(
+                [[50, 50, 100, 100, 0.85, 16]], dtype=np.float32)
+            mock_yolo.class_names = {15: 'Cat', 16: 'Dog'}
             
             # 検出処理実行
             results = self.coordinator._process_detection(mock_frame)
@@ -190,7 +185,28 @@ class TestTrackingCoordinator(unittest.TestCase):
             # 結果確認
             self.assertEqual(len(results), 1)
             self.assertEqual(results[0]['class_name'], 'Dog')
-            self.assertEqual(results[0]['confidence'], 0.85)
+            self.assertAlmostEqual(results[0]['confidence'], 0.85, places=5)
+            # 座標は元のフレーム（640x480）の解像度に戻される
+            self.assertEqual(results[0]['bbox'], (100, 100, 200, 200))
+            mock_yolo.detect_pets_array.assert_called_once()
+    
+    def test_best_detection_selection(self):
+        """複数検出時の追跡対象選択テスト"""
+        boxes = np.array([
+            [200, 150, 240, 190, 0.80, 16],  # 中心から離れている（信頼度はやや高い）
+            [300, 220, 340, 260, 0.75, 15],  # 画面中央
+            [500, 300, 600, 400, 0.60, 16]
+        ], dtype=np.float32)
+        
+        # 信頼度の差より中心からの距離が優先される
+        best = self.coordinator._select_best_detection(boxes)
+        self.assertEqual(int(best[5]), 15)
+        
+        # 信頼度の差が大きければ信頼度が優先される
+        boxes[0, 4] = 0.99
+        best = self.coordinator._select_best_detection(boxes)
+        self.assertEqual(int(best[5]), 16)
+        self.assertEqual(int(best[0]), 200)
     
     def test_tracking_control_with_detection(self):
         """検出ありの追跡制御テスト"""
@@ -198,7 +214,8 @@ class TestTrackingCoordinator(unittest.TestCase):
         self.coordinator.servo_controller = Mock()
         self.coordinator.servo_controller.is_angle_safe.return_value = True
         self.coordinator.simple_p_controller = Mock()
-        self.coordinator.simple_p_controller.calculate_correction.return_value = (2.0, -1.0)
+        self.coordinator.simple_p_controller.safe_calculate_correction.return_value = (2.0, -1.0)
+        self.coordinator.yolo_detector = Mock()
         
         # 検出結果をシミュレート
         detections = [{
@@ -218,13 +235,16 @@ class TestTrackingCoordinator(unittest.TestCase):
         self.assertEqual(self.coordinator.status.target_confidence, 0.75)
         
         # サーボ制御呼び出し確認
-        self.coordinator.servo_controller.set_angles.assert_called_once()
+        self.coordinator.servo_controller.set_target.assert_called_once()
+        
+        # カメラが動くため前回の検出結果の再利用が中止されること
+        self.coordinator.yolo_detector.invalidate_previous_result.assert_called_once()
     
     def test_tracking_control_without_detection(self):
         """検出なしの追跡制御テスト"""
         # 事前に追跡モードに設定
         self.coordinator.status.mode = TrackingMode.TRACKING
-        self.coordinator.status.last_detection_time = datetime.now()
+        self.coordinator.status.last_detection_time = time.monotonic()
         
         # 必要なモジュールをモック
         self.coordinator.servo_controller = Mock()
@@ -234,6 +254,23 @@ class TestTrackingCoordinator(unittest.TestCase):
         
         # 追跡制御実行
         self.coordinator._update_tracking_control(detections)
+    
+    def test_lost_target_switches_to_scanning(self):
+        """対象ロスト時のスキャンモード移行テスト"""
+        self.coordinator.status.mode = TrackingMode.TRACKING
+        self.coordinator.servo_controller = Mock()
+        self.coordinator.servo_controller.is_angle_safe.return_value = True
+        
+        # タイムアウト前は追跡モードを維持
+        self.coordinator.status.last_detection_time = time.monotonic()
+        self.coordinator._update_tracking_control([])
+        self.assertEqual(self.coordinator.status.mode, TrackingMode.TRACKING)
+        
+        # タイムアウト後はスキャンモードに移行
+        self.coordinator.status.last_detection_time = (
+            time.monotonic() - self.coordinator.lost_target_timeout - 1.0)
+        self.coordinator._update_tracking_control([])
+        self.assertEqual(self.coordinator.status.mode, TrackingMode.SCANNING)
         
         # 状態確認
         self.assertFalse(self.coordinator.status.target_detected)
@@ -248,7 +285,7 @@ class TestTrackingCoordinator(unittest.TestCase):
         self.coordinator._execute_scan_pattern()
         
         # サーボ制御が呼び出されることを確認
-        self.coordinator.servo_controller.set_angles.assert_called_once()
+        self.coordinator.servo_controller.set_target.assert_called_once()
     
     def test_display_frame_creation(self):
         """表示フレーム作成テスト"""
@@ -285,12 +322,25 @@ class TestTrackingCoordinator(unittest.TestCase):
         
         # 検出回数が変わらないことを確認
         self.assertEqual(self.coordinator.status.total_detections, 1)
+        
+        # 状態更新後のスナップショットが外部から参照できることを確認
+        self.assertEqual(self.coordinator.get_system_status()['total_detections'], 1)
+        
+        # 公開済みのスナップショットは作業用の状態の変更に影響されない
+        self.coordinator.status.total_detections = 5
+        self.assertEqual(self.coordinator.get_system_status()['total_detections'], 1)
+        
+        # 追跡時間は参照時に計算され、停止後は停止時刻で固定される
+        self.coordinator.system_start_time = time.monotonic() - 10.0
+        self.assertGreaterEqual(self.coordinator.get_system_status()['tracking_duration'], 10.0)
+        self.coordinator.system_stop_time = self.coordinator.system_start_time + 3.0
+        self.assertAlmostEqual(self.coordinator.get_system_status()['tracking_duration'], 3.0)
     
     def test_error_handling_in_detection(self):
         """検出処理でのエラーハンドリングテスト"""
         # YOLODetectorでエラーが発生する場合をモック
         with patch.object(self.coordinator, 'yolo_detector') as mock_yolo:
-            mock_yolo.detect_pets.side_effect = Exception("Detection error")
+            mock_yolo.detect_pets_array.side_effect = Exception("Detection error")
             
             # テスト用フレーム
             frame = np.zeros((480, 640, 3), dtype=np.uint8)
@@ -315,8 +365,16 @@ class TestTrackingCoordinator(unittest.TestCase):
         # エラーが発生しても例外が発生しないことを確認
         try:
             self.coordinator._update_tracking_control(detections)
+            self.coordinator._update_tracking_control(detections)
         except Exception:
             self.fail("追跡制御でエラーハンドリングが失敗しました")
+        
+        # エラーはその場でログ出力せず、まとめて1回だけ出力されることを確認
+        with patch.object(self.coordinator, 'logger') as mock_logger:
+            self.coordinator._flush_error_log()
+            mock_logger.error.assert_called_once()
+            self.assertIn("2回", mock_logger.error.call_args[0][0])
+        self.assertEqual(self.coordinator._error_counts, {})
     
     def test_cleanup_resources(self):
         """リソース解放テスト"""
@@ -393,7 +451,7 @@ class TestIntegrationScenarios(unittest.TestCase):
         self.coordinator.servo_controller.is_angle_safe.return_value = True  
         self.coordinator.yolo_detector = Mock()
         self.coordinator.simple_p_controller = Mock()
-        self.coordinator.simple_p_controller.calculate_correction.return_value = (1.0, -0.5)
+        self.coordinator.simple_p_controller.safe_calculate_correction.return_value = (1.0, -0.5)
         
         # 1. 初期状態確認
         self.assertEqual(self.coordinator.status.mode, TrackingMode.STANDBY)